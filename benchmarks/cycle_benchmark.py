@@ -0,0 +1,185 @@
+import argparse
+import ast
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_servers import FakeServer
+
+UPSTREAMS = ['node', 'dashtec', 'aztecscan', 'telegram']
+BENCHMARK_CONFIG = {
+    'checker_mode': 'threads',
+    'scheduler_mode': 'cycles',
+    'sleep_between_accs': (0, 0),
+    'mobile_proxy': '',
+    'enable_telegram_notifications': True,
+    'bot_api_key': 'benchmark',
+    'alarm_chat_id': '-1',
+    'alarm_digest_window': 0.5,
+    'report_formats': ['csv'],
+    'sqlite_report_path': '',
+    'metrics_port': 0,
+    'trace_enabled': False,
+}
+
+
+def load_config(overrides: dict):
+    from user_data import config
+
+    with open(os.path.join(os.path.dirname(__file__), '..', 'user_data', 'config-example.py')) as file:
+        exec(file.read(), config.__dict__)
+    config.__dict__.update(BENCHMARK_CONFIG)
+    config.__dict__.update(overrides)
+
+
+def run_worker(options: dict) -> dict:
+    load_config(overrides=options['config'])
+
+    from loguru import logger
+
+    from local_data import constants
+
+    constants.DASHTEC_API_URL = f"{options['urls']['dashtec']}/api"
+    constants.AZTECSCAN_API_URL = f"{options['urls']['aztecscan']}/v1/temporary-api-key"
+    constants.TELEGRAM_API_URL = options['urls']['telegram']
+
+    import main
+    from datatypes.csv_account import CsvAccount
+    from sdk.alarm_dispatcher import AlarmDispatcher
+    from sdk.clients import Clients
+    from sdk.telegram import Telegram
+    from tools.report_writer import ReportWriter
+    from user_data import config
+
+    logger.remove()
+    node_port = int(options['urls']['node'].rsplit(':', 1)[1])
+    accs = [
+        CsvAccount(id=index, address=f"0x{index:040x}", ip='127.0.0.1', port=node_port, note='benchmark')
+        for index in range(1, options['size'] + 1)
+    ]
+
+    telegram = AlarmDispatcher(
+        telegram=Telegram(bot_api_token=config.bot_api_key, alarm_chat_id=config.alarm_chat_id),
+        digest_window=config.alarm_digest_window,
+        renotify_interval=config.alarm_renotify_interval
+    )
+
+    clients = Clients(accs=accs)
+    cycle_times = []
+    cpu_started = time.process_time()
+    with tempfile.TemporaryDirectory() as reports_dir:
+        for cycle in range(options['cycles']):
+            clients.refresh()
+            started = time.perf_counter()
+            with ReportWriter(path=f"{reports_dir}/{cycle}", formats=config.report_formats) as report_writer:
+                main.run_cycle(
+                    accs=accs,
+                    report_writer=report_writer,
+                    explorer_browser=clients.explorer_browser,
+                    server_browser=clients.server_browser,
+                    telegram=telegram
+                )
+            cycle_times.append(time.perf_counter() - started)
+
+    telegram.close(timeout=30)
+    return {
+        'cycle_times': cycle_times,
+        'cpu_time': time.process_time() - cpu_started,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_size(size: int, args: argparse.Namespace, servers: dict[str, FakeServer], overrides: dict) -> dict:
+    for server in servers.values():
+        server.requests.clear()
+
+    options = {
+        'size': size,
+        'cycles': args.cycles,
+        'urls': {name: server.url for name, server in servers.items()},
+        'config': overrides,
+    }
+    worker = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.cycle_benchmark', '--worker', json.dumps(options)],
+        capture_output=True,
+        text=True,
+        cwd=os.path.join(os.path.dirname(__file__), '..')
+    )
+    if worker.returncode != 0:
+        raise Exception(f"benchmark worker failed for {size} accounts:\n{worker.stderr}")
+
+    result = json.loads(worker.stdout.strip().splitlines()[-1])
+    result['requests'] = {name: sum(server.requests.values()) for name, server in servers.items()}
+    return result
+
+
+def print_results(results: dict[int, dict], cycles: int):
+    header = f"{'accounts':>9} | {'cycle avg s':>11} | {'cycle max s':>11} | {'cpu s':>8} | {'rss MB':>7} | " + \
+             ' | '.join(f"{name + ' req':>13}" for name in UPSTREAMS)
+    print(header)
+    print('-' * len(header))
+    for size, result in results.items():
+        cycle_times = result['cycle_times']
+        print(
+            f"{size:>9} | {sum(cycle_times) / len(cycle_times):>11.2f} | {max(cycle_times):>11.2f} | "
+            f"{result['cpu_time']:>8.2f} | {result['peak_rss_mb']:>7.1f} | " +
+            ' | '.join(f"{result['requests'][name] / cycles:>13.1f}" for name in UPSTREAMS)
+        )
+    print(f"requests are per cycle, averaged over {cycles} cycle(s).")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="offline benchmark of monitoring cycles against local fake upstreams")
+    parser.add_argument('--sizes', default='10,100,1000,10000', help="comma separated account counts")
+    parser.add_argument('--cycles', type=int, default=2, help="cycles per account count")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE', help="config override")
+    parser.add_argument('--json', help="write results to this file")
+    for name in UPSTREAMS:
+        parser.add_argument(f'--{name}-latency', type=float, default=0.02, help=f"{name} latency in seconds")
+        parser.add_argument(f'--{name}-error-rate', type=float, default=0.0, help=f"{name} share of 503 responses")
+        parser.add_argument(f'--{name}-rate-limit', type=float, default=0.0, help=f"{name} requests/sec, 0 = unlimited")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.worker:
+        print(json.dumps(run_worker(options=json.loads(args.worker))))
+        sys.exit(0)
+
+    overrides = {}
+    for item in args.set:
+        key, value = item.split('=', 1)
+        try:
+            overrides[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            overrides[key] = value
+
+    servers = {
+        name: FakeServer(
+            name=name,
+            latency=getattr(args, f'{name}_latency'),
+            error_rate=getattr(args, f'{name}_error_rate'),
+            rate_limit=getattr(args, f'{name}_rate_limit')
+        ).start()
+        for name in UPSTREAMS
+    }
+
+    results = {}
+    try:
+        for size in [int(size) for size in args.sizes.split(',')]:
+            results[size] = run_size(size=size, args=args, servers=servers, overrides=overrides)
+            print(f"{size} accounts: {results[size]['cycle_times']}", file=sys.stderr)
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    print_results(results=results, cycles=args.cycles)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
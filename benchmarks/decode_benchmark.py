@@ -0,0 +1,51 @@
+import argparse
+import json
+import timeit
+
+from benchmarks.fake_servers import dashtec_validator_response, node_response
+
+ADDRESS = '0x' + '1' * 40
+PAYLOADS = {
+    'latest_block': json.dumps(node_response({'jsonrpc': '2.0', 'id': 1, 'method': 'node_getL2Tips'})),
+    'dashtec': json.dumps(dashtec_validator_response(ADDRESS)),
+    'telegram': json.dumps({'ok': True, 'result': {'message_id': 1}}),
+    'account': json.dumps({'id': '1', 'address': ADDRESS, 'ip': '127.0.0.1', 'port': '8080', 'note': ''}),
+}
+
+
+def decoders() -> dict:
+    from tools.decoder import decode_account, decode_dashtec, decode_latest_block, decode_telegram
+
+    return {
+        'latest_block': decode_latest_block,
+        'dashtec': decode_dashtec,
+        'telegram': decode_telegram,
+        'account': decode_account,
+    }
+
+
+def measure(number: int) -> dict:
+    from user_data import config
+
+    results = {}
+    for strict in (True, False):
+        config.strict_decoding = strict
+        for name, decode in decoders().items():
+            payload = PAYLOADS[name]
+            seconds = timeit.timeit(lambda: decode(json.loads(payload)), number=number)
+            results.setdefault(name, {})['strict' if strict else 'fast'] = seconds / number * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pydantic and fast-path response decoding.")
+    parser.add_argument('--number', type=int, default=20_000, help="decodes per payload and mode")
+    args = parser.parse_args()
+
+    print(f"{'payload':<14}{'strict, us':>12}{'fast, us':>12}{'speedup':>10}")
+    for name, timings in measure(number=args.number).items():
+        print(f"{name:<14}{timings['strict']:>12.2f}{timings['fast']:>12.2f}{timings['strict'] / timings['fast']:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BLOCK_HEIGHT = 50_000
+QUEUE_SIZE = 500
+
+
+def validator_index(address: str) -> int:
+    return int(address, 16) if address.startswith('0x') else 0
+
+
+def node_response(body: dict | list) -> dict | list:
+    def respond(call: dict) -> dict:
+        if call.get('method') == 'node_getL2Tips':
+            block = {'number': BLOCK_HEIGHT, 'hash': '0x' + '0' * 64}
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': {
+                'latest': block, 'proven': block, 'finalized': block
+            }}
+        if call.get('method') == 'node_getNodeInfo':
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': {'nodeVersion': '2.0.0'}}
+        return {'jsonrpc': '2.0', 'id': call.get('id'), 'error': {'code': -32601, 'message': 'method not found'}}
+
+    return [respond(call) for call in body] if isinstance(body, list) else respond(body)
+
+
+def dashtec_validator_response(address: str) -> dict:
+    index = validator_index(address)
+    if index % 10 == 0:
+        return {'error': 'Validator not found.'}
+
+    missed = 50 if index % 25 == 1 else 1
+    return {
+        'index': index,
+        'status': 'VALIDATING',
+        'balance': 200_000 * 10 ** 18,
+        'unclaimedRewards': 12 * 10 ** 18,
+        'attestationSuccess': f"{round(100 - missed / 2, 2)}%",
+        'totalAttestationsSucceeded': 100 - missed,
+        'totalAttestationsMissed': missed,
+        'totalBlocksProposed': 3,
+        'totalBlocksMined': 3,
+        'totalBlocksMissed': 0,
+    }
+
+
+def queue_position(address: str) -> int | None:
+    index = validator_index(address)
+    if index % 20 != 10 or index // 20 >= QUEUE_SIZE:
+        return None
+    return index // 20
+
+
+def dashtec_queue_response(query: dict) -> dict:
+    page = int(query.get('page', ['1'])[0])
+    limit = int(query.get('limit', ['10'])[0])
+    search = query.get('search', [None])[0]
+
+    if search:
+        position = queue_position(address=search)
+        return {'validatorsInQueue': [] if position is None else [{'address': search, 'position': position}]}
+
+    start = (page - 1) * limit
+    return {'validatorsInQueue': [
+        {'address': f"0x{position * 20 + 10:040x}", 'position': position}
+        for position in range(start, min(start + limit, QUEUE_SIZE))
+    ]}
+
+
+class FakeServer:
+    def __init__(self, name: str, latency: float = 0.0, error_rate: float = 0.0, rate_limit: float = 0.0):
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.requests = Counter()
+        self._tokens = rate_limit
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> 'FakeServer':
+        threading.Thread(target=self.server.serve_forever, name=f"fake-{self.name}", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _allow(self) -> bool:
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def route(self, method: str, path: str, query: dict, body: dict | list | None) -> tuple[int, dict | list]:
+        if path.endswith('/sendMessage'):
+            return 200, {'ok': True, 'result': {'message_id': 1}}
+        if path.endswith('/blocks-for-table'):
+            return 200, [{'height': str(BLOCK_HEIGHT)}]
+        if path.endswith('/validators/queue'):
+            return 200, dashtec_queue_response(query=query)
+        if '/validators/' in path:
+            return 200, dashtec_validator_response(address=path.rsplit('/', 1)[-1])
+        if method == 'POST':
+            return 200, node_response(body=body)
+        return 404, {'error': 'not found'}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+            wbufsize = 1 << 16
+
+            def _respond(self, method: str):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+
+                with fake._lock:
+                    fake.requests[method] += 1
+
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                if not fake._allow():
+                    if parsed.path.endswith('/sendMessage'):
+                        status, payload = 429, {
+                            'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                            'parameters': {'retry_after': 1}
+                        }
+                    else:
+                        status, payload = 429, {'error': 'rate limited'}
+                elif fake.error_rate and random.random() < fake.error_rate:
+                    status, payload = 503, {'error': 'unavailable'}
+                else:
+                    status, payload = fake.route(method, parsed.path, parse_qs(parsed.query), body)
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class AccountRecord:
+    id: int
+    address: str
+    ip: str
+    port: int
+    note: str = None
+
+
+@dataclass(frozen=True, slots=True)
+class BlockRecord:
+    number: int
+    hash: str
+
+
+@dataclass(frozen=True, slots=True)
+class LatestBlockResultRecord:
+    latest: BlockRecord
+    proven: BlockRecord
+    finalized: BlockRecord
+
+
+@dataclass(frozen=True, slots=True)
+class LatestBlockRecord:
+    jsonrpc: str
+    id: int
+    result: LatestBlockResultRecord
+
+
+@dataclass(frozen=True, slots=True)
+class DashtecRecord:
+    status: str
+    balance: int = None
+    unclaimedRewards: int = None
+    attestationSuccess: str = None
+    totalAttestationsSucceeded: int = None
+    totalAttestationsMissed: int = None
+    totalBlocksProposed: int = None
+    totalBlocksMined: int = None
+    totalBlocksMissed: int = None
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramRecord:
+    ok: bool
+    error_code: int = None
+    description: str = None
+    parameters: dict = None
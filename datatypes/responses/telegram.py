@@ -5,3 +5,4 @@ class TelegramResponse(BaseModel):
     ok: bool
     error_code: int = None
     description: str = None
+    parameters: dict = None
@@ -1 +1,19 @@
 DENOMINATION = 10 ** 18
+
+DASHTEC_API_URL = "https://dashtec.xyz/api"
+AZTECSCAN_API_URL = "https://api.testnet.aztecscan.xyz/v1/temporary-api-key"
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+LIVENESS_ALARM_TYPES = {'connection_refused', 'synced_out'}
+STATS_ALARM_TYPES = {'low_attestation_success', 'exited'}
+
+REPORT_FIELDNAMES = [
+    'id', 'address', 'ip', 'port', 'note',
+    'version', 'status', 'sync_latest', 'explorer_height', 'explorer_age',
+    'reference_height', 'reference_source', 'dashtec_age',
+    'balance', 'rewards',
+    'attestations_missed', 'attestations_succeeded', 'attestation_success',
+    'block_missed', 'block_mined', 'block_proposed',
+    'window_attestations_missed', 'window_attestations_succeeded', 'window_blocks_missed', 'window_blocks_mined',
+    'circuit'
+]
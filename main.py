@@ -1,59 +1,282 @@
-import csv
-import os
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
+import random
+import signal
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.parse import urlparse
 
 from loguru import logger
 
 from datatypes.csv_account import CsvAccount
 from datatypes.responses.balance import Balance
 from local_data import constants
+from sdk.alarm_dispatcher import AlarmDispatcher
 from sdk.aztec_browser import AztecBrowser
-from sdk.core_browser import CoreBrowser
+from sdk.clients import Clients
+from sdk.queue_index import QueueIndex
 from sdk.telegram import Telegram
 from tools.add_logger import add_logger
+from tools.attestation_window import attestation_counts, attestation_windows
+from tools.metrics import metrics, start_metrics_server
 from tools.read_file import read_csv
-from tools.retrier import retry
+from tools.reference_height import reference_height
+from tools.report_writer import ReportWriter
+from tools.circuit_breaker import breaker_summary
+from tools.fleet_state import FleetState
+from tools.hot_reload import HotReloader
+from tools.retrier import clear_deadline, retry, set_deadline
+from tools.scheduler import AdaptiveScheduler, classify
+from tools.sharding import ShardAlarmSink, ShardCoordinator, shard_for, watch_parent
 from tools.sleep import sleep_in_range
+from tools.sqlite_store import SqliteStore, check_retention
+from tools.status_api import fleet_status, start_status_server
+from tools.tracer import tracer
 from user_data import config
 
 
-def save_report(report_file: str, acc: CsvAccount, data: dict):
-    file_exists = os.path.exists(report_file)
-
-    with open(report_file, 'a', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'id', 'address', 'ip', 'port', 'note',
-            'version', 'status', 'sync_latest',
-            'balance', 'rewards',
-            'attestations_missed', 'attestations_succeeded', 'attestation_success',
-            'block_missed', 'block_mined', 'block_proposed'
-        ]
-
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        if not file_exists:
-            writer.writeheader()
-
-        row = {
-            'id': acc.id,
-            'address': acc.address,
-            'ip': acc.ip,
-            'port': acc.port,
-            'note': acc.note or '',
-            'status': data.get('status', ''),
-            'version': data.get('version', 'v0.0.0'),
-            'sync_latest': data.get('sync_latest', 0),
-            'balance': data.get('balance', 0),
-            'rewards': data.get('rewards', 0),
-            'attestations_missed': data.get('attestations_missed', 0),
-            'attestations_succeeded': data.get('attestations_succeeded', 0),
-            'attestation_success': data.get('attestation_success', 0),
-            'block_missed': data.get('block_missed', 0),
-            'block_mined': data.get('block_mined', 0),
-            'block_proposed': data.get('block_proposed', 0)
-        }
-
-        writer.writerow(row)
+STATS_LOG = (
+    "#{} | {} | {} | status: {} | sync (r/s): {}/{} | balance (r): {} $STK ({}), "
+    "attestations (m/s): {}/{} ({}), blocks (m/s/p): {}/{}/{}."
+)
+QUEUE_LOG = "#{} | {} | {} | status: {} | sync (r/s): {}/{}."
+
+
+def build_report_row(acc: CsvAccount, data: dict) -> dict:
+    return {
+        'id': acc.id,
+        'address': acc.address,
+        'ip': acc.ip,
+        'port': acc.port,
+        'note': acc.note or '',
+        'status': data.get('status', ''),
+        'version': data.get('version', 'v0.0.0'),
+        'sync_latest': data.get('sync_latest', 0),
+        'explorer_height': data.get('explorer_height', 0),
+        'explorer_age': data.get('explorer_age', 0),
+        'reference_height': data.get('reference_height', 0),
+        'reference_source': data.get('reference_source', ''),
+        'dashtec_age': data.get('dashtec_age', 0),
+        'balance': data.get('balance', 0),
+        'rewards': data.get('rewards', 0),
+        'attestations_missed': data.get('attestations_missed', 0),
+        'attestations_succeeded': data.get('attestations_succeeded', 0),
+        'attestation_success': data.get('attestation_success', 0),
+        'block_missed': data.get('block_missed', 0),
+        'block_mined': data.get('block_mined', 0),
+        'block_proposed': data.get('block_proposed', 0),
+        'window_attestations_missed': data.get('window_attestations_missed', 0),
+        'window_attestations_succeeded': data.get('window_attestations_succeeded', 0),
+        'window_blocks_missed': data.get('window_blocks_missed', 0),
+        'window_blocks_mined': data.get('window_blocks_mined', 0),
+        'circuit': data.get('circuit', '')
+    }
+
+
+def check_node(
+        acc: CsvAccount,
+        explorer_browser: AztecBrowser,
+        server_browser: AztecBrowser,
+        telegram: AlarmDispatcher,
+        acc_report: dict
+) -> bool:
+    acc_logger = logger.bind(id=acc.id, address=acc.address, stage="node")
+    node_state_r = server_browser.get_node_state_req(ip=acc.ip, port=acc.port)
+    if not node_state_r:
+        server_browser.reset_node_state(ip=acc.ip, port=acc.port)
+        acc_logger.error("#{} | {} | can't connect to {}:{}.", acc.id, acc.address, acc.ip, acc.port)
+        acc_report.update({'status': 'connection_refused'})
+        if config.enable_telegram_notifications:
+            telegram.send_alarm(
+                head=f"{acc.ip} | {acc.note}",
+                body="can't get the latest block.",
+                dashtec=f"https://dashtec.xyz/validators/{acc.address}",
+                sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}",
+                validator=acc.address,
+                alarm_type="connection_refused"
+            )
+        return False
+
+    server_block_r, node_version = node_state_r
+    acc_report['sync_latest'] = server_block_r.result.latest.number
+    acc_report['version'] = node_version
+
+    reference_height.observe(
+        node=f"{acc.ip}:{acc.port}",
+        latest=server_block_r.result.latest.number,
+        proven=server_block_r.result.proven.number,
+        finalized=server_block_r.result.finalized.number
+    )
+
+    explorer_block_r, explorer_age = False, 0
+    if config.reference_source != "fleet":
+        explorer_block_r, explorer_age = explorer_browser.get_cached_explorer_block_req()
+    latest_explorer_block = 0 if not explorer_block_r else int(explorer_block_r["height"])
+    acc_report['explorer_height'] = latest_explorer_block
+    acc_report['explorer_age'] = round(explorer_age, 1)
+
+    reference_block, reference_source = reference_height.estimate(explorer_height=latest_explorer_block)
+    acc_report['reference_height'] = reference_block
+    acc_report['reference_source'] = reference_source
+
+    if server_block_r.result.latest.number + 3 < reference_block:
+        acc_logger.warning(
+            "#{} | {} | {} height: {}, but the node is on {}.",
+            acc.id, acc.address, reference_source, reference_block, server_block_r.result.latest.number
+        )
+        acc_report.update({'status': 'synced_out'})
+        if config.enable_telegram_notifications:
+            telegram.send_alarm(
+                head=f"{acc.ip} | {acc.note}",
+                body=(
+                    f"{reference_source} height: {reference_block}\n"
+                    f"node height: {server_block_r.result.latest.number}"
+                ),
+                dashtec=f"https://dashtec.xyz/validators/{acc.address}",
+                sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}",
+                validator=acc.address,
+                alarm_type="synced_out"
+            )
+        return False
+
+    telegram.resolve(validator=acc.address, alarm_types=constants.LIVENESS_ALARM_TYPES)
+    return True
+
+
+def check_stats(
+        acc: CsvAccount,
+        explorer_browser: AztecBrowser,
+        telegram: AlarmDispatcher,
+        queue_index: QueueIndex | None,
+        acc_report: dict
+):
+    acc_logger = logger.bind(id=acc.id, address=acc.address, stage="stats")
+    node_version = acc_report['version']
+    node_height = acc_report['sync_latest']
+    reference_block = acc_report.get('reference_height') or acc_report['explorer_height']
+
+    dashtec_r, dashtec_age = explorer_browser.get_cached_dashtec_req(
+        address=acc.address,
+        explorer_height=reference_block
+    )
+    acc_report['dashtec_age'] = round(dashtec_age, 1)
+    if not dashtec_r:
+        acc_logger.warning("#{} | {} | can't get info about validator from dashtec.", acc.id, acc.address)
+        return
+
+    if dashtec_r.balance:
+        balance = Balance(int=dashtec_r.balance, float=round(dashtec_r.balance / constants.DENOMINATION, 2))
+        rewards = Balance(int=dashtec_r.balance, float=round(dashtec_r.unclaimedRewards / constants.DENOMINATION, 2))
+
+        acc_report.update({
+            'status': dashtec_r.status.lower(),
+            'balance': balance.float,
+            'rewards': rewards.float,
+            'attestations_missed': dashtec_r.totalAttestationsMissed,
+            'attestations_succeeded': dashtec_r.totalAttestationsSucceeded,
+            'attestation_success': dashtec_r.attestationSuccess,
+            'block_missed': dashtec_r.totalBlocksMissed,
+            'block_mined': dashtec_r.totalBlocksMined,
+            'block_proposed': dashtec_r.totalBlocksProposed
+        })
+
+        log_args = (
+            acc.id, acc.address, node_version, dashtec_r.status.lower(),
+            reference_block, node_height,
+            balance.float, rewards.float,
+            dashtec_r.totalAttestationsMissed, dashtec_r.totalAttestationsSucceeded, dashtec_r.attestationSuccess,
+            dashtec_r.totalBlocksMissed, dashtec_r.totalBlocksMined, dashtec_r.totalBlocksProposed
+        )
+
+        window = attestation_windows.update(
+            address=acc.address,
+            timestamp=time.time(),
+            counters=(
+                dashtec_r.totalAttestationsSucceeded,
+                dashtec_r.totalAttestationsMissed,
+                dashtec_r.totalBlocksMined,
+                dashtec_r.totalBlocksMissed
+            )
+        )
+        acc_report.update(window)
+
+        succeeded_attestations, total_attestations, windowed = attestation_counts(
+            row=acc_report,
+            window_min=config.attestation_window_min
+        )
+        scope = f"last {round(config.attestation_window / 60)} min" if windowed else "total"
+
+        if total_attestations:
+            attestation_success_rate = round(succeeded_attestations / total_attestations * 100, 2)
+            if attestation_success_rate < config.attestation_success_threshold:
+                acc_logger.error(STATS_LOG, *log_args)
+                if config.enable_telegram_notifications:
+                    telegram.send_alarm(
+                        head=f"{acc.ip} | {acc.note}",
+                        body=(
+                            f"low attestation success ({scope}): "
+                            f"{succeeded_attestations}/{total_attestations} "
+                            f"({attestation_success_rate}%)\n"
+                        ),
+                        dashtec=f"https://dashtec.xyz/validators/{acc.address}",
+                        sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}",
+                        validator=acc.address,
+                        alarm_type="low_attestation_success"
+                    )
+                return
+
+        telegram.resolve(validator=acc.address, alarm_types=constants.STATS_ALARM_TYPES)
+        if config.log_summary:
+            acc_logger.debug(STATS_LOG, *log_args)
+        else:
+            acc_logger.blue(STATS_LOG, *log_args)
+
+    elif dashtec_r.status == 'not_found':
+        queue_r = queue_index.get_position(address=acc.address) if queue_index else None
+        if queue_r is None:
+            queue_r = explorer_browser.get_queue_req(address=acc.address)
+        if queue_r:
+            status = f'#{queue_r}' if queue_r != "not_registered" else queue_r
+            acc_report.update({'status': status})
+            telegram.resolve(validator=acc.address, alarm_types=constants.STATS_ALARM_TYPES)
+            if queue_r == "not_registered":
+                acc_logger.error(QUEUE_LOG, acc.id, acc.address, node_version, status, reference_block, node_height)
+            else:
+                acc_logger.success(QUEUE_LOG, acc.id, acc.address, node_version, status, reference_block, node_height)
+    elif dashtec_r.status.lower() == 'exiting' or dashtec_r.status.lower() == 'zombie':
+        acc_report.update({'status': dashtec_r.status.lower()})
+        acc_logger.error("#{} | {} | {} | status: {}.", acc.id, acc.address, node_version, dashtec_r.status.lower())
+        if config.enable_telegram_notifications:
+            telegram.send_alarm(
+                head=f"{acc.ip} | {acc.note}",
+                body=f"status: exited.\n",
+                dashtec=f"https://dashtec.xyz/validators/{acc.address}",
+                sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}",
+                validator=acc.address,
+                alarm_type="exited"
+            )
+
+
+def log_checked(acc: CsvAccount, stage: str, started: float, acc_report: dict):
+    logger.bind(
+        id=acc.id,
+        address=acc.address,
+        stage=stage,
+        latency=round(time.perf_counter() - started, 3),
+        status=acc_report['status']
+    ).debug("checked")
+
+
+def circuit_summary(acc: CsvAccount) -> str:
+    return breaker_summary(hosts=[
+        f"{acc.ip}:{acc.port}",
+        urlparse(constants.DASHTEC_API_URL).netloc,
+        urlparse(constants.AZTECSCAN_API_URL).netloc
+    ])
 
 
 @retry(module="main_checker")
@@ -61,12 +284,18 @@ def main_checker(
         acc: CsvAccount,
         explorer_browser: AztecBrowser,
         server_browser: AztecBrowser,
-        telegram: Telegram
+        telegram: AlarmDispatcher,
+        queue_index: QueueIndex = None
 ):
     acc_report = {
         'status': '',
         'version': '',
         'sync_latest': 0,
+        'explorer_height': 0,
+        'explorer_age': 0,
+        'reference_height': 0,
+        'reference_source': '',
+        'dashtec_age': 0,
         'balance': 0,
         'rewards': 0,
         'attestations_missed': 0,
@@ -74,159 +303,277 @@ def main_checker(
         'attestation_success': 0,
         'block_missed': 0,
         'block_mined': 0,
-        'block_proposed': 0
+        'block_proposed': 0,
+        'window_attestations_missed': 0,
+        'window_attestations_succeeded': 0,
+        'window_blocks_missed': 0,
+        'window_blocks_mined': 0,
+        'circuit': ''
     }
 
+    started = time.perf_counter()
+    set_deadline(seconds=config.validator_deadline)
     try:
-        server_block_r = server_browser.get_server_block_req(ip=acc.ip, port=acc.port)
-        if not server_block_r:
-            logger.error(f"#{acc.id} | {acc.address} | can't connect to {acc.ip}:{acc.port}.")
-            acc_report.update({'status': 'connection_refused'})
-            if config.enable_telegram_notifications:
-                telegram.send_alarm(
-                    head=f"{acc.ip} | {acc.note}",
-                    body="can't get the latest block.",
-                    dashtec=f"https://dashtec.xyz/validators/{acc.address}",
-                    sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}"
-                )
-            return acc_report
+        if check_node(
+                acc=acc,
+                explorer_browser=explorer_browser,
+                server_browser=server_browser,
+                telegram=telegram,
+                acc_report=acc_report
+        ):
+            check_stats(
+                acc=acc,
+                explorer_browser=explorer_browser,
+                telegram=telegram,
+                queue_index=queue_index,
+                acc_report=acc_report
+            )
+    except Exception as e:
+        raise Exception(f"#{acc.id} | {acc.address} | exception: {e}")
+    finally:
+        clear_deadline()
+        acc_report['circuit'] = circuit_summary(acc=acc)
+        log_checked(acc=acc, stage="main_checker", started=started, acc_report=acc_report)
+        return acc_report
 
-        acc_report['sync_latest'] = server_block_r.result.latest.number
 
-        explorer_block_r = explorer_browser.get_explorer_block_req()
-        latest_explorer_block = 0 if not explorer_block_r else int(explorer_block_r["height"])
+@retry(module="liveness_checker")
+def liveness_checker(
+        acc: CsvAccount,
+        explorer_browser: AztecBrowser,
+        server_browser: AztecBrowser,
+        telegram: AlarmDispatcher
+):
+    acc_report = {
+        'status': '',
+        'version': '',
+        'sync_latest': 0,
+        'explorer_height': 0,
+        'explorer_age': 0,
+        'reference_height': 0,
+        'reference_source': '',
+        'circuit': ''
+    }
 
-        node_version = server_browser.get_version_req(ip=acc.ip, port=acc.port)
-        acc_report['version'] = node_version
+    started = time.perf_counter()
+    set_deadline(seconds=config.liveness_deadline)
+    try:
+        check_node(
+            acc=acc,
+            explorer_browser=explorer_browser,
+            server_browser=server_browser,
+            telegram=telegram,
+            acc_report=acc_report
+        )
+    except Exception as e:
+        raise Exception(f"#{acc.id} | {acc.address} | exception: {e}")
+    finally:
+        clear_deadline()
+        acc_report['circuit'] = circuit_summary(acc=acc)
+        log_checked(acc=acc, stage="liveness_checker", started=started, acc_report=acc_report)
+        return acc_report
 
-        if server_block_r.result.latest.number + 3 < latest_explorer_block:
-            logger.warning(
-                f"#{acc.id} | {acc.address} | "
-                f"explorer height: {latest_explorer_block}, but the node is on {server_block_r.result.latest.number}."
-            )
-            acc_report.update({'status': 'synced_out'})
-            if config.enable_telegram_notifications:
-                telegram.send_alarm(
-                    head=f"{acc.ip} | {acc.note}",
-                    body=(
-                        f"explorer height: {latest_explorer_block}\n"
-                        f"node height: {server_block_r.result.latest.number}"
-                    ),
-                    dashtec=f"https://dashtec.xyz/validators/{acc.address}",
-                    sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}"
-                )
-            return acc_report
 
-        dashtec_r = explorer_browser.get_dashtec_req(address=acc.address)
-        if not dashtec_r:
-            logger.warning(
-                f"#{acc.id} | {acc.address} | can't get info about validator from dashtec."
-            )
-            return acc_report
-
-        if dashtec_r.balance:
-            balance = Balance(int=dashtec_r.balance, float=round(dashtec_r.balance / constants.DENOMINATION, 2))
-            rewards = Balance(int=dashtec_r.balance, float=round(dashtec_r.unclaimedRewards / constants.DENOMINATION, 2))
-
-            acc_report.update({
-                'status': dashtec_r.status.lower(),
-                'balance': balance.float,
-                'rewards': rewards.float,
-                'attestations_missed': dashtec_r.totalAttestationsMissed,
-                'attestations_succeeded': dashtec_r.totalAttestationsSucceeded,
-                'attestation_success': dashtec_r.attestationSuccess,
-                'block_missed': dashtec_r.totalBlocksMissed,
-                'block_mined': dashtec_r.totalBlocksMined,
-                'block_proposed': dashtec_r.totalBlocksProposed
-            })
-
-            log = (
-                f"#{acc.id} | {acc.address} | {node_version} | status: {dashtec_r.status.lower()} | "
-                f"sync (e/s): {latest_explorer_block}/{server_block_r.result.latest.number} | "
-                f"balance (r): {balance.float} $STK ({rewards.float}), "
-                f"attestations (m/s): "
-                f"{dashtec_r.totalAttestationsMissed}/"
-                f"{dashtec_r.totalAttestationsSucceeded} ({dashtec_r.attestationSuccess}), "
-                f"blocks (m/s/p): "
-                f"{dashtec_r.totalBlocksMissed}/{dashtec_r.totalBlocksMined}/{dashtec_r.totalBlocksProposed}."
-            )
+@retry(module="stats_checker")
+def stats_checker(
+        acc: CsvAccount,
+        explorer_browser: AztecBrowser,
+        telegram: AlarmDispatcher,
+        queue_index: QueueIndex | None,
+        fleet: FleetState
+):
+    liveness = fleet.get_liveness(acc_id=acc.id)
+    acc_report = {
+        'status': '',
+        'version': liveness.get('version', ''),
+        'sync_latest': liveness.get('sync_latest', 0),
+        'explorer_height': liveness.get('explorer_height', 0),
+        'reference_height': liveness.get('reference_height', 0),
+        'dashtec_age': 0,
+        'balance': 0,
+        'rewards': 0,
+        'attestations_missed': 0,
+        'attestations_succeeded': 0,
+        'attestation_success': 0,
+        'block_missed': 0,
+        'block_mined': 0,
+        'block_proposed': 0,
+        'window_attestations_missed': 0,
+        'window_attestations_succeeded': 0,
+        'window_blocks_missed': 0,
+        'window_blocks_mined': 0
+    }
 
-            total_attestations = dashtec_r.totalAttestationsMissed + dashtec_r.totalAttestationsSucceeded
-            if total_attestations:
-                attestation_success_rate = round(dashtec_r.totalAttestationsSucceeded / total_attestations * 100, 2)
-                if attestation_success_rate < config.attestation_success_threshold:
-                    logger.error(log)
-                    if config.enable_telegram_notifications:
-                        telegram.send_alarm(
-                            head=f"{acc.ip} | {acc.note}",
-                            body=(
-                                f"low attestation success: "
-                                f"{dashtec_r.totalAttestationsSucceeded}/{total_attestations} "
-                                f"({attestation_success_rate}%)\n"
-                            ),
-                            dashtec=f"https://dashtec.xyz/validators/{acc.address}",
-                            sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}"
-                        )
-                    return acc_report
-
-            logger.blue(log)
-            return acc_report
-
-        elif dashtec_r.status == 'not_found':
-            queue_r = explorer_browser.get_queue_req(address=acc.address)
-            if queue_r:
-                status = f'#{queue_r}' if queue_r != "not_registered" else queue_r
-                acc_report.update({'status': status})
-                if queue_r == "not_registered":
-                    logger.error(
-                        f"#{acc.id} | {acc.address} | {node_version} | status: {status} | "
-                        f"sync (e/s): {latest_explorer_block}/{server_block_r.result.latest.number}."
-                    )
-                else:
-                    logger.success(
-                        f"#{acc.id} | {acc.address} | {node_version} | status: {status} | "
-                        f"sync (e/s): {latest_explorer_block}/{server_block_r.result.latest.number}."
-                    )
-        elif dashtec_r.status.lower() == 'exiting' or dashtec_r.status.lower() == 'zombie':
-            acc_report.update({'status': dashtec_r.status.lower()})
-            logger.error(f"#{acc.id} | {acc.address} | {node_version} | status: {dashtec_r.status.lower()}.")
-            if config.enable_telegram_notifications:
-                telegram.send_alarm(
-                    head=f"{acc.ip} | {acc.note}",
-                    body=f"status: exited.\n",
-                    dashtec=f"https://dashtec.xyz/validators/{acc.address}",
-                    sepoliascan=f"https://sepolia.etherscan.io/address/{acc.address}"
-                )
+    started = time.perf_counter()
+    set_deadline(seconds=config.validator_deadline)
+    try:
+        check_stats(
+            acc=acc,
+            explorer_browser=explorer_browser,
+            telegram=telegram,
+            queue_index=queue_index,
+            acc_report=acc_report
+        )
     except Exception as e:
         raise Exception(f"#{acc.id} | {acc.address} | exception: {e}")
     finally:
+        clear_deadline()
+        log_checked(acc=acc, stage="stats_checker", started=started, acc_report=acc_report)
         return acc_report
 
 
-if __name__ == '__main__':
-    add_logger()
-    accs = read_csv('./user_data/accounts.csv')
-
-    while True:
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            report_file = f"user_data/reports/{timestamp}.csv"
-            os.makedirs(os.path.dirname(report_file), exist_ok=True)
+def run_cycle(
+        accs: list[CsvAccount],
+        report_writer: ReportWriter | None,
+        explorer_browser: AztecBrowser,
+        server_browser: AztecBrowser,
+        telegram: AlarmDispatcher,
+        queue_index: QueueIndex = None
+) -> list[dict]:
+    # drop spans recorded since the previous cycle, e.g. the sleep between cycles
+    tracer.reset()
+    cycle_started = time.perf_counter()
+    rows = []
+    if config.queue_index_mode and queue_index is None:
+        queue_index = QueueIndex(browser=explorer_browser)
 
-            explorer_browser = AztecBrowser(browser=CoreBrowser(proxy=config.mobile_proxy))
-            server_browser = AztecBrowser(browser=CoreBrowser())
-            telegram = Telegram(bot_api_token=config.bot_api_key, alarm_chat_id=config.alarm_chat_id)
+    def collect(acc: CsvAccount, acc_report: dict):
+        rows.append(build_report_row(acc=acc, data=acc_report))
+        metrics.update_validator(row=rows[-1])
+        fleet_status.update(row=rows[-1])
+        if report_writer:
+            report_writer.write(row=rows[-1])
 
-            for acc in accs:
-                acc_report = main_checker(
+    if config.checker_mode == "threads":
+        with ThreadPoolExecutor(max_workers=config.node_concurrency) as executor:
+            futures = {
+                executor.submit(
+                    main_checker,
                     acc=acc,
                     explorer_browser=explorer_browser,
                     server_browser=server_browser,
+                    telegram=telegram,
+                    queue_index=queue_index
+                ): acc for acc in accs
+            }
+            for future in as_completed(futures):
+                collect(acc=futures[future], acc_report=future.result())
+    else:
+        for acc in accs:
+            acc_report = main_checker(
+                acc=acc,
+                explorer_browser=explorer_browser,
+                server_browser=server_browser,
+                telegram=telegram,
+                queue_index=queue_index
+            )
+
+            collect(acc=acc, acc_report=acc_report)
+            sleep_in_range(*config.sleep_between_accs)
+
+    log_cycle_summary(rows=rows)
+    report_trace(validator_stage="main_checker")
+    metrics.set_gauge("aztec_monitor_cycle_duration_seconds", time.perf_counter() - cycle_started)
+    metrics.set_gauge("aztec_monitor_checked_validators", len(rows))
+    metrics.inc_counter("aztec_monitor_cycles_total")
+    return rows
+
+
+def log_cycle_summary(rows: list[dict]):
+    if not config.log_summary:
+        return
+
+    priorities = Counter()
+    healthy_statuses = Counter()
+    for row in rows:
+        priority = classify(
+            row=row,
+            attestation_success_threshold=config.attestation_success_threshold,
+            attestation_window_min=config.attestation_window_min
+        )
+        priorities[priority] += 1
+        if priority == 'healthy':
+            healthy_statuses[row['status']] += 1
+
+    logger.blue(
+        f"{priorities['healthy']} healthy validator(s) "
+        f"({', '.join(f'{status}: {count}' for status, count in healthy_statuses.most_common())}), "
+        f"{priorities['alarm']} with alarms, {priorities['queued']} queued."
+    )
+
+
+def report_trace(validator_stage: str):
+    if not tracer.enabled:
+        return
+
+    spans = tracer.reset()
+    tracer.report(spans=spans, top=config.trace_top, validator_stage=validator_stage)
+    if config.trace_dump_dir:
+        tracer.dump(spans=spans, path=f"{config.trace_dump_dir}/{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+
+def store_rows(sqlite_store: SqliteStore | None, cycle_start: datetime, rows: list[dict]):
+    if not sqlite_store:
+        return
+
+    sqlite_store.write_cycle(timestamp=int(cycle_start.timestamp()), rows=rows)
+    sqlite_store.downsample(
+        raw_retention_days=config.sqlite_raw_retention_days,
+        hourly_retention_days=config.sqlite_hourly_retention_days
+    )
+
+
+def drop_accounts(accs: list[CsvAccount], clients: Clients, telegram: AlarmDispatcher):
+    for acc in accs:
+        metrics.remove_validator(acc_id=acc.id)
+        fleet_status.remove(acc_id=acc.id)
+        telegram.resolve(validator=acc.address)
+        clients.server_browser.reset_node_state(ip=acc.ip, port=acc.port)
+        clients.explorer_browser.reset_dashtec_state(address=acc.address)
+        attestation_windows.forget(address=acc.address)
+
+
+def update_accounts(updated: list[tuple[CsvAccount, CsvAccount]], clients: Clients):
+    for old, new in updated:
+        # validator series are labelled by id, address and ip
+        if (old.id, old.address, old.ip) != (new.id, new.address, new.ip):
+            metrics.remove_validator(acc_id=old.id)
+        if old.id != new.id:
+            fleet_status.remove(acc_id=old.id)
+        if (old.ip, old.port) != (new.ip, new.port):
+            clients.server_browser.reset_node_state(ip=old.ip, port=old.port)
+
+
+def run_cycles(
+        accs: list[CsvAccount],
+        clients: Clients,
+        telegram: AlarmDispatcher,
+        sqlite_store: SqliteStore | None,
+        reloader: HotReloader
+):
+    while True:
+        try:
+            diff = reloader.poll(accs=accs)
+            if diff:
+                drop_accounts(accs=diff.removed, clients=clients, telegram=telegram)
+                update_accounts(updated=diff.updated, clients=clients)
+                accs = diff.accs
+
+            cycle_start = datetime.now()
+            timestamp = cycle_start.strftime("%Y%m%d-%H%M%S")
+            clients.refresh()
+
+            with ReportWriter(path=f"user_data/reports/{timestamp}", formats=config.report_formats) as report_writer:
+                rows = run_cycle(
+                    accs=accs,
+                    report_writer=report_writer,
+                    explorer_browser=clients.explorer_browser,
+                    server_browser=clients.server_browser,
                     telegram=telegram
                 )
 
-                save_report(report_file=report_file, acc=acc, data=acc_report)
-                sleep_in_range(*config.sleep_between_accs)
+            store_rows(sqlite_store=sqlite_store, cycle_start=cycle_start, rows=rows)
+            attestation_windows.save()
 
             sleep_in_range(
                 sec_from=config.sleep_between_loop[0],
@@ -234,7 +581,361 @@ if __name__ == '__main__':
                 log="after loop"
             )
 
-        except KeyboardInterrupt:
-            exit()
         except Exception as e:
             logger.exception(e)
+
+
+def run_adaptive(
+        accs: list[CsvAccount],
+        clients: Clients,
+        telegram: AlarmDispatcher,
+        sqlite_store: SqliteStore | None,
+        reloader: HotReloader
+):
+    scheduler = AdaptiveScheduler(intervals=config.recheck_intervals)
+    for acc in accs:
+        scheduler.add(acc=acc)
+
+    latest_rows = {}
+    queue_index = None
+    next_report = time.monotonic() + random.randint(*config.sleep_between_loop)
+
+    while True:
+        try:
+            diff = reloader.poll(accs=accs)
+            if diff:
+                drop_accounts(accs=diff.removed, clients=clients, telegram=telegram)
+                for acc in diff.removed:
+                    scheduler.remove(acc_id=acc.id)
+                    latest_rows.pop(acc.id, None)
+                for acc in diff.added:
+                    scheduler.add(acc=acc)
+                update_accounts(updated=diff.updated, clients=clients)
+                for old, new in diff.updated:
+                    scheduler.replace(old=old, new=new)
+                    if old.id != new.id:
+                        latest_rows.pop(old.id, None)
+                accs = diff.accs
+            scheduler.intervals = config.recheck_intervals
+
+            due_accs = scheduler.pop_due()
+            if due_accs:
+                clients.refresh()
+                if config.queue_index_mode and (queue_index is None or queue_index.age() >= config.queue_index_ttl):
+                    queue_index = QueueIndex(browser=clients.explorer_browser)
+                rows = run_cycle(
+                    accs=due_accs,
+                    report_writer=None,
+                    explorer_browser=clients.explorer_browser,
+                    server_browser=clients.server_browser,
+                    telegram=telegram,
+                    queue_index=queue_index
+                )
+                priorities = Counter()
+                for row in rows:
+                    latest_rows[row['id']] = row
+                    priority = classify(
+                        row=row,
+                        attestation_success_threshold=config.attestation_success_threshold,
+                        attestation_window_min=config.attestation_window_min
+                    )
+                    scheduler.reschedule(acc_id=row['id'], priority=priority)
+                    priorities[priority] += 1
+                logger.info(f"checked {len(rows)} validator(s): {dict(priorities)}.")
+
+            if latest_rows and time.monotonic() >= next_report:
+                cycle_start = datetime.now()
+                rows = list(latest_rows.values())
+                with ReportWriter(
+                        path=f"user_data/reports/{cycle_start.strftime('%Y%m%d-%H%M%S')}",
+                        formats=config.report_formats
+                ) as report_writer:
+                    for row in rows:
+                        report_writer.write(row=row)
+                store_rows(sqlite_store=sqlite_store, cycle_start=cycle_start, rows=rows)
+                attestation_windows.save()
+                next_report = time.monotonic() + random.randint(*config.sleep_between_loop)
+
+            next_due = scheduler.next_due() or next_report
+            wake_up = min(next_due, next_report) - time.monotonic()
+            if config.hot_reload_interval:
+                wake_up = min(wake_up, config.hot_reload_interval)
+            time.sleep(max(1.0, wake_up))
+
+        except Exception as e:
+            logger.exception(e)
+            time.sleep(1)
+
+
+def run_liveness_loop(fleet: FleetState, clients: Clients, telegram: AlarmDispatcher, passed: threading.Event):
+    while True:
+        try:
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=config.node_concurrency) as executor:
+                futures = {
+                    executor.submit(
+                        liveness_checker,
+                        acc=acc,
+                        explorer_browser=clients.explorer_browser,
+                        server_browser=clients.server_browser,
+                        telegram=telegram
+                    ): acc for acc in fleet.get_accounts()
+                }
+                for future in as_completed(futures):
+                    acc = futures[future]
+                    fleet.update_liveness(acc_id=acc.id, report=future.result())
+                    row = build_report_row(acc=acc, data=fleet.data(acc_id=acc.id))
+                    metrics.update_validator(row=row)
+                    fleet_status.update(row=row)
+
+            metrics.set_gauge("aztec_monitor_liveness_duration_seconds", time.monotonic() - started)
+            passed.set()
+            time.sleep(max(1.0, config.liveness_interval - (time.monotonic() - started)))
+
+        except Exception as e:
+            logger.exception(e)
+            time.sleep(1)
+
+
+def run_stats_pass(fleet: FleetState, clients: Clients, telegram: AlarmDispatcher):
+    accs = fleet.get_accounts()
+    queue_index = None
+    if config.queue_index_mode:
+        queue_index = QueueIndex(browser=clients.explorer_browser)
+
+    rows = []
+
+    def collect(acc: CsvAccount, acc_report: dict):
+        fleet.update_stats(acc_id=acc.id, report=acc_report)
+        rows.append(build_report_row(acc=acc, data=fleet.data(acc_id=acc.id)))
+        metrics.update_validator(row=rows[-1])
+        fleet_status.update(row=rows[-1])
+
+    if config.checker_mode == "threads":
+        with ThreadPoolExecutor(max_workers=config.external_concurrency) as executor:
+            futures = {
+                executor.submit(
+                    stats_checker,
+                    acc=acc,
+                    explorer_browser=clients.explorer_browser,
+                    telegram=telegram,
+                    queue_index=queue_index,
+                    fleet=fleet
+                ): acc for acc in accs
+            }
+            for future in as_completed(futures):
+                collect(acc=futures[future], acc_report=future.result())
+    else:
+        for acc in accs:
+            acc_report = stats_checker(
+                acc=acc,
+                explorer_browser=clients.explorer_browser,
+                telegram=telegram,
+                queue_index=queue_index,
+                fleet=fleet
+            )
+
+            collect(acc=acc, acc_report=acc_report)
+            sleep_in_range(*config.sleep_between_accs)
+
+    log_cycle_summary(rows=rows)
+
+
+def run_tiered(
+        accs: list[CsvAccount],
+        clients: Clients,
+        telegram: AlarmDispatcher,
+        sqlite_store: SqliteStore | None,
+        reloader: HotReloader
+):
+    fleet = FleetState(accs=accs)
+    liveness_passed = threading.Event()
+    threading.Thread(
+        target=run_liveness_loop,
+        kwargs={'fleet': fleet, 'clients': clients, 'telegram': telegram, 'passed': liveness_passed},
+        name="liveness-loop",
+        daemon=True
+    ).start()
+    liveness_passed.wait(timeout=config.validator_deadline)
+
+    while True:
+        try:
+            diff = reloader.poll(accs=accs)
+            if diff:
+                drop_accounts(accs=diff.removed, clients=clients, telegram=telegram)
+                update_accounts(updated=diff.updated, clients=clients)
+                accs = diff.accs
+                fleet.set_accounts(accs=accs)
+
+            cycle_start = datetime.now()
+            cycle_started = time.perf_counter()
+            clients.refresh()
+            tracer.reset()
+            run_stats_pass(fleet=fleet, clients=clients, telegram=telegram)
+            attestation_windows.save()
+            report_trace(validator_stage="stats_checker")
+
+            rows = [build_report_row(acc=acc, data=data) for acc, data in fleet.snapshot()]
+            with ReportWriter(
+                    path=f"user_data/reports/{cycle_start.strftime('%Y%m%d-%H%M%S')}",
+                    formats=config.report_formats
+            ) as report_writer:
+                for row in rows:
+                    report_writer.write(row=row)
+            store_rows(sqlite_store=sqlite_store, cycle_start=cycle_start, rows=rows)
+
+            metrics.set_gauge("aztec_monitor_cycle_duration_seconds", time.perf_counter() - cycle_started)
+            metrics.set_gauge("aztec_monitor_checked_validators", len(rows))
+            metrics.inc_counter("aztec_monitor_cycles_total")
+
+            sleep_in_range(
+                sec_from=config.sleep_between_loop[0],
+                sec_to=config.sleep_between_loop[1],
+                log="after loop"
+            )
+
+        except Exception as e:
+            logger.exception(e)
+
+
+def shard_accounts(accs: list[CsvAccount], shard: int, shards: int) -> list[CsvAccount]:
+    return [acc for acc in accs if shard_for(address=acc.address, shards=shards) == shard]
+
+
+def run_shard(shard: int, shards: int, events):
+    add_logger(
+        log_output=f"./log/shard-{shard}.log",
+        enqueue=config.log_enqueue,
+        json_output=f"{config.log_json_path}.shard-{shard}" if config.log_json_path else ""
+    )
+    watch_parent()
+    tracer.enabled = config.trace_enabled
+    all_accs = read_csv('./user_data/accounts.csv')
+    accs = shard_accounts(accs=all_accs, shard=shard, shards=shards)
+    telegram = ShardAlarmSink(events=events)
+    if config.attestation_window_path:
+        attestation_windows.load(path=f"{config.attestation_window_path}.shard-{shard}")
+    clients = Clients(accs=accs)
+    reloader = HotReloader(accounts_path='./user_data/accounts.csv')
+    logger.info(f"shard #{shard}: {len(accs)} account(s) loaded.")
+
+    while True:
+        try:
+            diff = reloader.poll(accs=all_accs)
+            if diff:
+                removed = shard_accounts(accs=diff.removed, shard=shard, shards=shards)
+                drop_accounts(accs=removed, clients=clients, telegram=telegram)
+                updated = [
+                    (old, new) for old, new in diff.updated if shard_for(address=new.address, shards=shards) == shard
+                ]
+                update_accounts(updated=updated, clients=clients)
+                all_accs = diff.accs
+                accs = shard_accounts(accs=all_accs, shard=shard, shards=shards)
+
+            clients.refresh()
+            rows = run_cycle(
+                accs=accs,
+                report_writer=None,
+                explorer_browser=clients.explorer_browser,
+                server_browser=clients.server_browser,
+                telegram=telegram
+            )
+            attestation_windows.save()
+            events.put(('metrics', shard, metrics.collect_deltas()))
+            events.put(('cycle', shard, rows))
+
+            sleep_in_range(
+                sec_from=config.sleep_between_loop[0],
+                sec_to=config.sleep_between_loop[1],
+                log="after loop"
+            )
+
+        except Exception as e:
+            logger.exception(e)
+
+
+def write_shard_report(sqlite_store: SqliteStore | None, reloader: HotReloader, rows: list[dict], reported: set):
+    reloader.poll(accs=None)
+    ids = {row['id'] for row in rows}
+    for acc_id in reported - ids:
+        metrics.remove_validator(acc_id=acc_id)
+        fleet_status.remove(acc_id=acc_id)
+    reported.clear()
+    reported.update(ids)
+
+    cycle_start = datetime.now()
+    with ReportWriter(
+            path=f"user_data/reports/{cycle_start.strftime('%Y%m%d-%H%M%S')}",
+            formats=config.report_formats
+    ) as report_writer:
+        for row in rows:
+            metrics.update_validator(row=row)
+            fleet_status.update(row=row)
+            report_writer.write(row=row)
+    store_rows(sqlite_store=sqlite_store, cycle_start=cycle_start, rows=rows)
+
+    metrics.set_gauge("aztec_monitor_checked_validators", len(rows))
+    metrics.inc_counter("aztec_monitor_cycles_total")
+    logger.info(f"[shards] report with {len(rows)} validator(s) written.")
+
+
+def stop_on_signal(signum, frame):
+    logger.info(f"received signal {signum}, stopping.")
+    raise SystemExit(0)
+
+
+if __name__ == '__main__':
+    add_logger(enqueue=config.log_enqueue, json_output=config.log_json_path)
+    tracer.enabled = config.trace_enabled
+    accs = read_csv('./user_data/accounts.csv')
+    telegram = AlarmDispatcher(
+        telegram=Telegram(bot_api_token=config.bot_api_key, alarm_chat_id=config.alarm_chat_id),
+        digest_window=config.alarm_digest_window,
+        renotify_interval=config.alarm_renotify_interval
+    )
+    sqlite_store = None
+    if config.sqlite_report_path:
+        check_retention(
+            raw_retention_days=config.sqlite_raw_retention_days,
+            hourly_retention_days=config.sqlite_hourly_retention_days
+        )
+        sqlite_store = SqliteStore(path=config.sqlite_report_path)
+    attestation_windows.load(path=config.attestation_window_path)
+    if config.metrics_port:
+        start_metrics_server(host=config.metrics_host, port=config.metrics_port)
+    if config.status_api_port:
+        start_status_server(host=config.status_api_host, port=config.status_api_port)
+    clients = Clients(accs=accs)
+    reloader = HotReloader(accounts_path='./user_data/accounts.csv')
+    logger.info(f"startup took {time.perf_counter() - STARTUP_STARTED:.2f} sec, {len(accs)} account(s) loaded.")
+
+    coordinator = None
+    signal.signal(signal.SIGTERM, stop_on_signal)
+    try:
+        if config.shard_workers > 1:
+            reported = set()
+            coordinator = ShardCoordinator(
+                worker=run_shard,
+                shards=config.shard_workers,
+                telegram=telegram,
+                on_cycle=lambda rows: write_shard_report(
+                    sqlite_store=sqlite_store,
+                    reloader=reloader,
+                    rows=rows,
+                    reported=reported
+                ),
+                report_timeout=config.shard_report_timeout,
+                restart_delay=config.shard_restart_delay
+            )
+            coordinator.run()
+        elif config.scheduler_mode == "tiered":
+            run_tiered(accs=accs, clients=clients, telegram=telegram, sqlite_store=sqlite_store, reloader=reloader)
+        elif config.scheduler_mode == "adaptive":
+            run_adaptive(accs=accs, clients=clients, telegram=telegram, sqlite_store=sqlite_store, reloader=reloader)
+        else:
+            run_cycles(accs=accs, clients=clients, telegram=telegram, sqlite_store=sqlite_store, reloader=reloader)
+    except (KeyboardInterrupt, SystemExit):
+        if coordinator:
+            coordinator.stop()
+        telegram.close()
+        exit()
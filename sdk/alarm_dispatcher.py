@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+
+from loguru import logger
+
+from sdk.telegram import Telegram
+
+MAX_SEND_ATTEMPTS = 5
+
+
+class AlarmDispatcher:
+    def __init__(self, telegram: Telegram, digest_window: float, renotify_interval: float):
+        self.telegram = telegram
+        self.digest_window = digest_window
+        self.renotify_interval = renotify_interval
+        self.states: dict[str, dict[str, float]] = {}
+        self.queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="alarm-dispatcher", daemon=True)
+        self.thread.start()
+
+    def send_alarm(
+            self,
+            head: str,
+            body: str,
+            dashtec: str,
+            sepoliascan: str,
+            validator: str = None,
+            alarm_type: str = None
+    ) -> bool:
+        if validator is not None:
+            now = time.monotonic()
+            with self._lock:
+                sent_at = self.states.setdefault(validator, {})
+                if alarm_type in sent_at and now - sent_at[alarm_type] < self.renotify_interval:
+                    return False
+                sent_at[alarm_type] = now
+
+        self.queue.put({'head': head, 'body': body, 'dashtec': dashtec, 'sepoliascan': sepoliascan})
+        return True
+
+    def resolve(self, validator: str, alarm_types: set[str] = None):
+        with self._lock:
+            sent_at = self.states.get(validator)
+            if sent_at is None:
+                return
+            for alarm_type in list(sent_at) if alarm_types is None else alarm_types:
+                sent_at.pop(alarm_type, None)
+            if not sent_at:
+                del self.states[validator]
+
+    def close(self, timeout: float = 10):
+        self.queue.put(None)
+        self.thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            alarm = self.queue.get()
+            if alarm is None:
+                return
+
+            alarms = [alarm]
+            deadline = time.monotonic() + self.digest_window
+            closing = False
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    alarm = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if alarm is None:
+                    closing = True
+                    break
+                alarms.append(alarm)
+
+            if len(alarms) == 1:
+                messages = [self.telegram.format_alarm(**alarms[0])]
+            else:
+                messages = self.telegram.digest_messages(alarms=alarms)
+
+            for text in messages:
+                self._deliver(text=text)
+
+            if closing:
+                return
+
+    def _deliver(self, text: str):
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            try:
+                telegram_r = self.telegram.send_text(text=text)
+            except Exception as e:
+                logger.warning(f"[telegram] send attempt #{attempt}/{MAX_SEND_ATTEMPTS} failed: {e}")
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            if telegram_r.ok:
+                return
+            if telegram_r.error_code == 429:
+                retry_after = (telegram_r.parameters or {}).get('retry_after', 5)
+                logger.warning(f"[telegram] rate limited, retry after {retry_after} sec.")
+                time.sleep(retry_after)
+                continue
+
+            logger.error(f"[telegram] can't send alarm: {telegram_r.error_code} {telegram_r.description}.")
+            return
+
+        logger.error(f"[telegram] alarm dropped after {MAX_SEND_ATTEMPTS} attempts.")
@@ -1,24 +1,50 @@
+import itertools
+import json
+import time
+
 from datatypes.responses.dashtec import DashtecResponse
 from datatypes.responses.latest_block import LatestBlockResponse
+from local_data import constants
 from sdk.core_browser import CoreBrowser
 
+from tools.cache import TTLCache
+from tools.decoder import decode_dashtec, decode_latest_block
 from tools.retrier import retry
 from user_data import config
 
+RPC_IDS = itertools.count(1)
+
+
+def _parse_version(r: dict) -> str:
+    return f"v{r.get('result')['nodeVersion']}" if r.get('result')["nodeVersion"] else 'v0.0.0'
+
 
 class AztecBrowser(CoreBrowser):
     def __init__(self, browser: CoreBrowser):
         self.max_retries = config.max_retries
+        self.node_versions = TTLCache(ttl=config.node_version_ttl)
+        self.node_heights: dict[str, int] = {}
+        self.browser = browser
+        self.proxy = browser.proxy
+        self.session = browser.session
+        self.explorer_cache = TTLCache(ttl=config.explorer_cache_ttl)
+        self.dashtec_cache: dict[str, tuple[DashtecResponse, float, int, dict]] = {}
+
+    def set_browser(self, browser: CoreBrowser):
+        self.browser = browser
         self.proxy = browser.proxy
         self.session = browser.session
 
+    def process_request(self, *args, **kwargs) -> dict | None:
+        return self.browser.process_request(*args, **kwargs)
+
     @retry(module="aztec: get_server_block_req")
     def get_server_block_req(self, ip: str, port: int) -> LatestBlockResponse:
         payload = {
             "jsonrpc": "2.0",
             "method": "node_getL2Tips",
             "params": [],
-            "id": 67
+            "id": next(RPC_IDS)
         }
         r = self.process_request(
             method="POST",
@@ -27,7 +53,7 @@ class AztecBrowser(CoreBrowser):
         )
 
         if r and r.get('result'):
-            return LatestBlockResponse(**r)
+            return decode_latest_block(r)
         else:
             raise Exception(f"can't get the latest block: {r}")
 
@@ -37,7 +63,7 @@ class AztecBrowser(CoreBrowser):
             "jsonrpc": "2.0",
             "method": "node_getNodeInfo",
             "params": [],
-            "id": 67
+            "id": next(RPC_IDS)
         }
         r = self.process_request(
             method="POST",
@@ -46,39 +72,134 @@ class AztecBrowser(CoreBrowser):
         )
 
         if r and r.get('result'):
-            return f"v{r.get('result')['nodeVersion']}" if r.get('result')["nodeVersion"] else 'v0.0.0'
+            return _parse_version(r)
         else:
             raise Exception(f"can't get node version: {r}")
 
-    @retry(module="aztec: get_dashtec_req")
-    def get_dashtec_req(self, address: str) -> DashtecResponse:
+    @retry(module="aztec: get_node_batch_req")
+    def get_node_batch_req(self, ip: str, port: int) -> tuple[LatestBlockResponse, str | None]:
+        tips_id, info_id = next(RPC_IDS), next(RPC_IDS)
+        payload = [
+            {"jsonrpc": "2.0", "method": "node_getL2Tips", "params": [], "id": tips_id},
+            {"jsonrpc": "2.0", "method": "node_getNodeInfo", "params": [], "id": info_id}
+        ]
+
         r = self.process_request(
+            method="POST",
+            url=f"http://{ip}:{port}",
+            payload=payload
+        )
+        results = {item.get('id'): item for item in r if isinstance(item, dict)} if isinstance(r, list) else {}
+
+        tips_r = results.get(tips_id)
+        if not tips_r or not tips_r.get('result'):
+            raise Exception(f"can't get the latest block: {r}")
+
+        info_r = results.get(info_id)
+        node_version = _parse_version(info_r) if info_r and info_r.get('result') else None
+        return decode_latest_block(tips_r), node_version
+
+    def get_node_state_req(self, ip: str, port: int) -> tuple[LatestBlockResponse, str] | bool:
+        node = f"{ip}:{port}"
+        cached_version = self.node_versions.peek(node)
+
+        if config.node_rpc_batching:
+            node_batch_r = self.get_node_batch_req(ip=ip, port=port)
+            if not node_batch_r:
+                return False
+            server_block_r, node_version = node_batch_r
+        else:
+            server_block_r = self.get_server_block_req(ip=ip, port=port)
+            if not server_block_r:
+                return False
+            node_version = None
+
+        restarted = self._track_height(node=node, height=server_block_r.result.latest.number)
+        if node_version is None:
+            if cached_version and not restarted:
+                return server_block_r, cached_version[0]
+            node_version = self.get_version_req(ip=ip, port=port)
+
+        if node_version:
+            self.node_versions.set(node, node_version)
+        return server_block_r, node_version
+
+    def _track_height(self, node: str, height: int) -> bool:
+        previous_height = self.node_heights.get(node)
+        self.node_heights[node] = height
+        return previous_height is not None and height < previous_height
+
+    def reset_dashtec_state(self, address: str):
+        self.dashtec_cache.pop(address, None)
+
+    def reset_node_state(self, ip: str, port: int):
+        node = f"{ip}:{port}"
+        self.node_versions.invalidate(node)
+        self.node_heights.pop(node, None)
+
+    @retry(module="aztec: get_dashtec_req")
+    def get_dashtec_req(self, address: str, validators: dict = None) -> tuple[DashtecResponse | None, dict]:
+        response = self.process_request(
             method="GET",
-            url=f"https://dashtec.xyz/api/validators/{address}?"
+            url=f"{constants.DASHTEC_API_URL}/validators/{address}?",
+            headers=validators,
+            return_type="response"
         )
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        if response.status_code == 304:
+            return None, validators
+
+        r = json.loads(response.content) if response.content else {}
         if r and r.get('index'):
-            return DashtecResponse(**r)
+            return decode_dashtec(r), validators
         elif r.get('error') == "Validator not found.":
-            return DashtecResponse(status='not_found')
+            return decode_dashtec({'status': 'not_found'}), validators
         else:
             raise Exception(f"can't get validator dashtec: {r}")
 
+    def get_cached_dashtec_req(self, address: str, explorer_height: int) -> tuple[DashtecResponse | bool, float]:
+        entry = self.dashtec_cache.get(address)
+        if entry and config.dashtec_cache_ttl:
+            dashtec_r, fetched_at, height, _ = entry
+            age = time.monotonic() - fetched_at
+            if age < config.dashtec_cache_ttl and explorer_height - height < config.dashtec_cache_blocks:
+                return dashtec_r, age
+
+        dashtec_req = self.get_dashtec_req(address=address, validators=entry[3] if entry else None)
+        if not dashtec_req:
+            return False, 0
+        dashtec_r, validators = dashtec_req
+        if dashtec_r is None:
+            if not entry:
+                raise Exception(f"dashtec returned 304 for {address} without a cached response")
+            dashtec_r = entry[0]
+
+        self.dashtec_cache[address] = (dashtec_r, time.monotonic(), explorer_height, validators)
+        return dashtec_r, 0
+
     @retry(module="aztec: get_explorer_block_req")
     def get_explorer_block_req(self) -> DashtecResponse:
         r = self.process_request(
             method="GET",
-            url=f"https://api.testnet.aztecscan.xyz/v1/temporary-api-key/l2/ui/blocks-for-table"
+            url=f"{constants.AZTECSCAN_API_URL}/l2/ui/blocks-for-table"
         )
         if r:
             return r[0]
         else:
             raise Exception(f"can't get explorer block: {r}")
 
+    def get_cached_explorer_block_req(self) -> tuple[dict | bool, float]:
+        return self.explorer_cache.get(key="explorer_block", fetch=self.get_explorer_block_req)
+
     @retry(module="aztec: get_queue_req")
     def get_queue_req(self, address: str) -> str:
         r = self.process_request(
             method="GET",
-            url=f"https://dashtec.xyz/api/validators/queue?page=1&limit=10&search={address}"
+            url=f"{constants.DASHTEC_API_URL}/validators/queue?page=1&limit=10&search={address}"
         )
         if r and r.get('validatorsInQueue'):
             return r.get('validatorsInQueue')[0].get('position', 999_999)
@@ -86,3 +207,14 @@ class AztecBrowser(CoreBrowser):
             return "not_registered"
         else:
             raise Exception(f"can't get validator queue position: {r}")
+
+    @retry(module="aztec: get_queue_page_req")
+    def get_queue_page_req(self, page: int, limit: int) -> list[dict]:
+        r = self.process_request(
+            method="GET",
+            url=f"{constants.DASHTEC_API_URL}/validators/queue?page={page}&limit={limit}"
+        )
+        if r and 'validatorsInQueue' in r:
+            return r.get('validatorsInQueue') or []
+        else:
+            raise Exception(f"can't get validator queue page #{page}: {r}")
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from datatypes.csv_account import CsvAccount
+from local_data import constants
+from sdk.aztec_browser import AztecBrowser
+from sdk.core_browser import CoreBrowser
+from sdk.node_rpc import NodeRpcClient
+from sdk.proxy_pool import ProxyPool
+from tools.circuit_breaker import CLOSED, get_breaker
+from user_data import config
+
+
+class Clients:
+    def __init__(self, accs: list[CsvAccount]):
+        nodes = Counter(f"{acc.ip}:{acc.port}" for acc in accs)
+        self.node_pool_hosts = max(len(nodes), 1)
+        self.node_pool_size = max(nodes.values(), default=1)
+        self.explorer_created = 0.0
+        self._explorer_browser: AztecBrowser | None = None
+        self._server_browser: AztecBrowser | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def explorer_browser(self) -> AztecBrowser:
+        if self._explorer_browser is None:
+            with self._lock:
+                if self._explorer_browser is None:
+                    self._explorer_browser = AztecBrowser(browser=self._new_explorer_core())
+        return self._explorer_browser
+
+    @property
+    def server_browser(self) -> AztecBrowser:
+        if self._server_browser is None:
+            with self._lock:
+                if self._server_browser is None:
+                    self._server_browser = AztecBrowser(
+                        browser=NodeRpcClient(
+                            max_concurrency=config.node_concurrency,
+                            pool_hosts=self.node_pool_hosts,
+                            pool_size=self.node_pool_size
+                        )
+                    )
+        return self._server_browser
+
+    def _new_explorer_core(self) -> CoreBrowser | ProxyPool:
+        started = time.perf_counter()
+        if config.mobile_proxies:
+            browser = ProxyPool(
+                proxies=config.mobile_proxies,
+                max_concurrency=config.external_concurrency,
+                rate_limit=config.proxy_rate_limit,
+                eviction_time=config.proxy_eviction_time,
+                failure_threshold=config.proxy_failure_threshold
+            )
+        else:
+            browser = CoreBrowser(proxy=config.mobile_proxy, max_concurrency=config.external_concurrency)
+        self.explorer_created = time.monotonic()
+        logger.info(f"explorer session created in {time.perf_counter() - started:.2f} sec.")
+        return browser
+
+    def refresh(self):
+        if self._explorer_browser is None:
+            return
+
+        age = time.monotonic() - self.explorer_created
+        external_hosts = [urlparse(constants.DASHTEC_API_URL).netloc, urlparse(constants.AZTECSCAN_API_URL).netloc]
+        if config.session_rotation_interval and age >= config.session_rotation_interval:
+            reason = "rotation interval"
+        elif not config.mobile_proxies and age >= config.breaker_reset_timeout and any(
+                get_breaker(host).state != CLOSED for host in external_hosts
+        ):
+            reason = "proxy failure"
+        else:
+            return
+
+        logger.info(f"rebuilding explorer session: {reason}.")
+        previous = self._explorer_browser.browser
+        self._explorer_browser.set_browser(browser=self._new_explorer_core())
+        previous.close()
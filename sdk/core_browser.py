@@ -1,18 +1,61 @@
 import json
+import math
+import threading
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
-import tls_client
-from fake_useragent import UserAgent
+from loguru import logger
 
+from tools.circuit_breaker import get_breaker
+from tools.metrics import metrics
+from tools.retrier import remaining_time
+from tools.tracer import tracer
 from user_data import config
 
+if TYPE_CHECKING:
+    import tls_client
+
+
+class HttpStatusError(Exception):
+    def __init__(self, status_code: int, host: str):
+        super().__init__(f"HTTP {status_code} from {host}")
+        self.status_code = status_code
+
+
+_user_agents = None
+_user_agents_lock = threading.Lock()
+
+
+def random_user_agent() -> str:
+    global _user_agents
+    with _user_agents_lock:
+        if _user_agents is None:
+            from fake_useragent import UserAgent
+            _user_agents = UserAgent(browsers=["Safari"], os=["Mac OS X"])
+        return _user_agents.random
+
 
 class CoreBrowser:
-    def __init__(self, proxy: str = None):
+    def __init__(
+            self,
+            proxy: str = None,
+            max_concurrency: int = None,
+            timeout: float = None,
+            upstream: str = None,
+            breaker_scope: str = None
+    ):
         self.max_retries = config.max_retries
         self.proxy = proxy
+        self.timeout = timeout or config.request_timeout
+        self.upstream = upstream
+        self.breaker_scope = breaker_scope
         self.session = self.init_session()
+        self.semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def init_session(self) -> "tls_client.Session":
+        import tls_client
 
-    def init_session(self) -> tls_client.Session:
         session = tls_client.Session(
             client_identifier="safari_16_0",
             random_tls_extension_order=True
@@ -25,7 +68,7 @@ class CoreBrowser:
             }
 
         session.headers.update({
-            "User-Agent": UserAgent(browsers=["Safari"], os=["Mac OS X"]).random,
+            "User-Agent": random_user_agent(),
         })
 
         return session
@@ -33,10 +76,16 @@ class CoreBrowser:
     def update_headers(self, headers: dict):
         self.session.headers.update(headers)
 
+    def close(self):
+        try:
+            self.session.close()
+        except Exception as e:
+            logger.warning(f"can't close session: {e}")
+
     def process_request(
             self,
             url: str,
-            payload: dict = None,
+            payload: dict | list = None,
             method: str = "GET",
             headers: dict = None,
             return_type: str = "content",
@@ -47,14 +96,38 @@ class CoreBrowser:
         if headers:
             local_headers.update(headers)
 
-        if method.lower() == 'get':
-            response = self.session.get(url=url, headers=local_headers, allow_redirects=allow_redirects)
-        elif method.lower() == 'post':
-            response = self.session.post(url=url, json=payload, headers=local_headers)
-        elif method.lower() == 'options':
-            response = self.session.options(url=url, json=payload, headers=local_headers)
-        else:
-            raise Exception("unsupported HTTP method")
+        if remaining_time() <= 0:
+            raise Exception("validator deadline exceeded")
+
+        host = urlparse(url).netloc
+        upstream = self.upstream or host
+        breaker = get_breaker(host=f"{self.breaker_scope}/{host}" if self.breaker_scope else host)
+        breaker.before_request()
+        if self.semaphore:
+            wait = remaining_time()
+            if not self.semaphore.acquire(timeout=None if math.isinf(wait) else wait):
+                raise Exception("validator deadline exceeded while waiting for a connection slot")
+        try:
+            # the time spent waiting for a slot is already taken from the deadline
+            timeout = min(self.timeout, remaining_time())
+            if timeout <= 0:
+                raise Exception("validator deadline exceeded")
+            try:
+                response = self._send(url, payload, method, local_headers, allow_redirects, timeout, upstream)
+            except Exception:
+                breaker.record_failure()
+                metrics.inc_counter("aztec_monitor_requests_total", upstream=upstream, outcome="error")
+                raise
+        finally:
+            if self.semaphore:
+                self.semaphore.release()
+
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+            metrics.inc_counter("aztec_monitor_requests_total", upstream=upstream, outcome=str(response.status_code))
+            raise HttpStatusError(status_code=response.status_code, host=host)
+        breaker.record_success()
+        metrics.inc_counter("aztec_monitor_requests_total", upstream=upstream, outcome="ok")
 
         if return_type == 'content':
             return json.loads(response.content) if response.content else {}
@@ -64,5 +137,45 @@ class CoreBrowser:
             return response.headers
         elif return_type == 'html' or return_type == 'text':
             return response.text
+        elif return_type == 'response':
+            return response
 
         return None
+
+    def _send(
+            self,
+            url: str,
+            payload: dict | list,
+            method: str,
+            headers: dict,
+            allow_redirects: bool,
+            timeout: float,
+            upstream: str
+    ):
+        started = time.perf_counter()
+        try:
+            with tracer.span(f"http: {upstream}"):
+                return self._request(url, payload, method, headers, allow_redirects, timeout)
+        finally:
+            metrics.observe("aztec_monitor_request_duration_seconds", time.perf_counter() - started, upstream=upstream)
+
+    def _request(
+            self,
+            url: str,
+            payload: dict | list,
+            method: str,
+            headers: dict,
+            allow_redirects: bool,
+            timeout: float
+    ):
+        timeout_seconds = max(1, math.ceil(timeout))
+        if method.lower() == 'get':
+            return self.session.get(
+                url=url, headers=headers, allow_redirects=allow_redirects, timeout_seconds=timeout_seconds
+            )
+        elif method.lower() == 'post':
+            return self.session.post(url=url, json=payload, headers=headers, timeout_seconds=timeout_seconds)
+        elif method.lower() == 'options':
+            return self.session.options(url=url, json=payload, headers=headers, timeout_seconds=timeout_seconds)
+        else:
+            raise Exception("unsupported HTTP method")
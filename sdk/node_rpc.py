@@ -0,0 +1,46 @@
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from sdk.core_browser import CoreBrowser
+from user_data import config
+
+
+class NodeRpcClient(CoreBrowser):
+    def __init__(self, max_concurrency: int = None, timeout: float = None, pool_hosts: int = 1000, pool_size: int = 1):
+        self.pool_hosts = pool_hosts
+        # keep-alive connections per node: one per concurrent check, but no more than validators on that node
+        self.pool_size = max(1, min(max_concurrency or 1, pool_size))
+        super().__init__(
+            max_concurrency=max_concurrency,
+            timeout=timeout or config.node_request_timeout,
+            upstream="node"
+        )
+
+    def init_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_hosts, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+
+    def _request(
+            self,
+            url: str,
+            payload: dict | list,
+            method: str,
+            headers: dict,
+            allow_redirects: bool,
+            timeout: float
+    ):
+        if method.lower() != 'post':
+            raise Exception("node RPC supports POST only")
+
+        return self.session.post(
+            url=url,
+            data=json.dumps(payload, separators=(',', ':')),
+            headers=headers,
+            timeout=(min(config.node_connect_timeout, timeout), timeout)
+        )
@@ -0,0 +1,164 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from sdk.core_browser import CoreBrowser, HttpStatusError
+from tools.circuit_breaker import CircuitOpenError
+from tools.metrics import metrics
+from tools.retrier import remaining_time
+
+HEALTH_DECAY = 0.8
+BUDGET_WAIT_STEP = 0.05
+
+
+def proxy_label(proxy: str, index: int) -> str:
+    # mobile proxies often share one endpoint and differ only in credentials, the index keeps labels unique
+    parsed = urlparse(proxy)
+    if not parsed.hostname:
+        return f"#{index}"
+    user = f"{parsed.username}@" if parsed.username else ""
+    return f"#{index} {user}{parsed.hostname}:{parsed.port}"
+
+
+class PooledProxy:
+    def __init__(self, proxy: str, index: int, max_concurrency: int, rate_limit: float):
+        self.proxy = proxy
+        self.label = proxy_label(proxy=proxy, index=index)
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.browser = self.new_browser()
+        self.health = 1.0
+        self.failures = 0
+        self.evicted_until = 0.0
+        self.tokens = max(rate_limit, 1)
+        self.refilled_at = time.monotonic()
+        self.in_flight = 0
+
+    def new_browser(self) -> CoreBrowser:
+        return CoreBrowser(proxy=self.proxy, max_concurrency=self.max_concurrency, breaker_scope=self.label)
+
+    def refill(self, now: float):
+        if self.rate_limit:
+            self.tokens = min(max(self.rate_limit, 1), self.tokens + (now - self.refilled_at) * self.rate_limit)
+        self.refilled_at = now
+
+    def available(self, now: float) -> bool:
+        return self.evicted_until <= now and (not self.rate_limit or self.tokens >= 1)
+
+    def score(self) -> float:
+        return self.health * (self.tokens if self.rate_limit else 1) / (self.in_flight + 1)
+
+
+class ProxyPool:
+    def __init__(
+            self,
+            proxies: list[str],
+            max_concurrency: int,
+            rate_limit: float,
+            eviction_time: float,
+            failure_threshold: int
+    ):
+        self.proxies = [
+            PooledProxy(proxy=proxy, index=index, max_concurrency=max_concurrency, rate_limit=rate_limit)
+            for index, proxy in enumerate(proxies)
+        ]
+        self.eviction_time = eviction_time
+        self.failure_threshold = failure_threshold
+        self.proxy = self.proxies[0].proxy
+        self.session = self.proxies[0].browser.session
+        self._lock = threading.Lock()
+        for pooled in self.proxies:
+            self._publish(pooled=pooled)
+
+    def close(self):
+        for pooled in self.proxies:
+            pooled.browser.close()
+
+    def process_request(self, *args, **kwargs) -> dict | None:
+        skipped = set()
+        while True:
+            pooled = self._acquire(skipped=skipped)
+            try:
+                response = pooled.browser.process_request(*args, **kwargs)
+                break
+            except CircuitOpenError:
+                self._release(pooled=pooled)
+                skipped.add(pooled.label)
+            except HttpStatusError as e:
+                self._record(pooled=pooled, ok=False, evict=e.status_code == 429)
+                raise
+            except Exception:
+                self._record(pooled=pooled, ok=False, evict=False)
+                raise
+
+        self._record(pooled=pooled, ok=True, evict=False)
+        return response
+
+    def healthy(self) -> int:
+        now = time.monotonic()
+        return sum(1 for pooled in self.proxies if pooled.evicted_until <= now)
+
+    def _acquire(self, skipped: set[str]) -> PooledProxy:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                for pooled in self.proxies:
+                    pooled.refill(now=now)
+                    if pooled.evicted_until and pooled.evicted_until <= now:
+                        self._revive(pooled=pooled)
+
+                candidates = [
+                    pooled for pooled in self.proxies if pooled.label not in skipped and pooled.available(now=now)
+                ]
+                if candidates:
+                    pooled = max(candidates, key=PooledProxy.score)
+                    pooled.tokens -= 1
+                    pooled.in_flight += 1
+                    return pooled
+
+                if all(pooled.label in skipped for pooled in self.proxies):
+                    raise CircuitOpenError(f"circuit open for all {len(self.proxies)} proxies")
+                if all(pooled.evicted_until > now or pooled.label in skipped for pooled in self.proxies):
+                    raise Exception(f"all {len(self.proxies)} proxies are evicted")
+
+            if remaining_time() < BUDGET_WAIT_STEP:
+                raise Exception("validator deadline exceeded while waiting for proxy budget")
+            time.sleep(BUDGET_WAIT_STEP)
+
+    def _release(self, pooled: PooledProxy):
+        with self._lock:
+            pooled.in_flight -= 1
+            pooled.tokens += 1
+
+    def _record(self, pooled: PooledProxy, ok: bool, evict: bool):
+        with self._lock:
+            pooled.in_flight -= 1
+            pooled.health = pooled.health * HEALTH_DECAY + (1 - HEALTH_DECAY) * ok
+            pooled.failures = 0 if ok else pooled.failures + 1
+            if not ok and pooled.evicted_until <= time.monotonic() and (
+                    evict or pooled.failures >= self.failure_threshold
+            ):
+                pooled.evicted_until = time.monotonic() + self.eviction_time
+                logger.warning(
+                    f"[proxy] {pooled.label} evicted for {self.eviction_time} sec "
+                    f"({'rate limited' if evict else f'{pooled.failures} failure(s)'}), "
+                    f"{self.healthy()}/{len(self.proxies)} healthy."
+                )
+        metrics.inc_counter("aztec_monitor_proxy_requests_total", proxy=pooled.label, outcome="ok" if ok else "error")
+        self._publish(pooled=pooled)
+
+    def _revive(self, pooled: PooledProxy):
+        pooled.evicted_until = 0.0
+        pooled.failures = 0
+        pooled.health = max(pooled.health, 0.5)
+        pooled.browser.close()
+        pooled.browser = pooled.new_browser()
+        logger.info(f"[proxy] {pooled.label} is back in the pool with a new session.")
+        self._publish(pooled=pooled)
+
+    @staticmethod
+    def _publish(pooled: PooledProxy):
+        metrics.set_gauge("aztec_monitor_proxy_health", round(pooled.health, 3), proxy=pooled.label)
+        metrics.set_gauge("aztec_monitor_proxy_evicted", int(pooled.evicted_until > time.monotonic()), proxy=pooled.label)
@@ -0,0 +1,50 @@
+import threading
+import time
+
+from loguru import logger
+
+from sdk.aztec_browser import AztecBrowser
+from user_data import config
+
+
+class QueueIndex:
+    def __init__(self, browser: AztecBrowser):
+        self.browser = browser
+        self.positions: dict[str, int] = {}
+        self.next_page = 1
+        self.complete = False
+        self.failed = False
+        self.created_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def walk(self, address: str) -> bool:
+        while address not in self.positions and not self.complete:
+            page = self.next_page
+            validators = self.browser.get_queue_page_req(page=page, limit=config.queue_page_limit)
+            if validators is False:
+                logger.warning(f"can't walk queue index, page #{page} failed.")
+                return False
+
+            for validator in validators:
+                if validator.get('address'):
+                    self.positions[validator['address'].lower()] = validator.get('position', 999_999)
+
+            self.next_page += 1
+            if len(validators) < config.queue_page_limit:
+                self.complete = True
+                logger.info(f"queue index: {len(self.positions)} validators from {page} page(s).")
+        return True
+
+    def get_position(self, address: str) -> int | str | None:
+        address = address.lower()
+        with self._lock:
+            if not self.failed:
+                self.failed = not self.walk(address=address)
+            if address in self.positions:
+                return self.positions[address]
+            if self.complete:
+                return "not_registered"
+        return None
@@ -1,8 +1,15 @@
 import re
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from datatypes.responses.telegram import TelegramResponse
+from local_data import constants
+from tools.decoder import decode_telegram
+from tools.tracer import tracer
+from user_data import config
+
+MESSAGE_LIMIT = 4000
 
 
 def _escape_markdown_v2(text: str) -> str:
@@ -17,25 +24,49 @@ class Telegram:
     ):
         self.bot_api_token = bot_api_token
         self.alarm_chat_id = alarm_chat_id
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
 
     def _send_message(self, text: str, chat_id: str, parse_mode: str = "MarkdownV2") -> TelegramResponse:
-        response = requests.post(
-            f"https://api.telegram.org/bot{self.bot_api_token}/sendMessage",
-            json={
-                "chat_id": chat_id,
-                "text": text,
-                "parse_mode": parse_mode,
-                "disable_web_page_preview": True
-            }
-        ).json()
-        return TelegramResponse.parse_obj(response)
+        with tracer.span("telegram"):
+            response = self.session.post(
+                f"{constants.TELEGRAM_API_URL}/bot{self.bot_api_token}/sendMessage",
+                json={
+                    "chat_id": chat_id,
+                    "text": text,
+                    "parse_mode": parse_mode,
+                    "disable_web_page_preview": True
+                },
+                timeout=config.telegram_timeout
+            ).json()
+        return decode_telegram(response)
 
-    def send_alarm(self, head: str, body: str, dashtec: str, sepoliascan: str) -> TelegramResponse:
+    @staticmethod
+    def format_alarm(head: str, body: str, dashtec: str, sepoliascan: str) -> str:
         head_escaped = _escape_markdown_v2(head)
         body_escaped = _escape_markdown_v2(body)
-        text = (
+        return (
             f"*{head_escaped}*\n\n"
             f"[DASHTEC]({dashtec}) /// [SEPOLIASCAN]({sepoliascan})\n\n"
             f"`{body_escaped}`"
         )
+
+    def send_alarm(self, head: str, body: str, dashtec: str, sepoliascan: str) -> TelegramResponse:
+        text = self.format_alarm(head=head, body=body, dashtec=dashtec, sepoliascan=sepoliascan)
+        return self._send_message(text=text, chat_id=self.alarm_chat_id)
+
+    def digest_messages(self, alarms: list[dict]) -> list[str]:
+        messages = []
+        current = f"*{_escape_markdown_v2(f'{len(alarms)} alarms')}*"
+        for alarm in alarms:
+            text = self.format_alarm(**alarm)
+            if len(current) + len(text) + 2 > MESSAGE_LIMIT:
+                messages.append(current)
+                current = text
+            else:
+                current = f"{current}\n\n{text}"
+        messages.append(current)
+        return messages
+
+    def send_text(self, text: str) -> TelegramResponse:
         return self._send_message(text=text, chat_id=self.alarm_chat_id)
@@ -1,3 +1,4 @@
+import json
 from sys import stderr
 
 from loguru import logger
@@ -33,25 +34,64 @@ logger.__class__.cyan = cyan
 logger.__class__.magenta = magenta
 
 
-def add_logger(log_output: str = LOG_OUTPUT, log_rotation: str = LOG_ROTATION):
+LOG_LEVEL = "INFO"
+ICONS = {
+    "SUCCESS": "[+]",
+    "INFO": "[•]",
+    "WARNING": "[!]",
+    "ERROR": "[-]",
+    "BLUE": "[•]",
+    "YELLOW": "[•]",
+    "CYAN": "[•]",
+    "MAGENTA": "[•]",
+}
+JSON_EXTRA_FIELDS = ("id", "address", "stage", "latency", "status")
+
+
+def _add_icon(record) -> bool:
+    record["extra"]["icon"] = ICONS.get(record["level"].name, record["level"].name)
+    return True
+
+
+def _add_json(record) -> bool:
+    entry = {
+        "time": record["time"].isoformat(timespec="milliseconds"),
+        "level": record["level"].name,
+        "message": record["message"],
+    }
+    for field in JSON_EXTRA_FIELDS:
+        if field in record["extra"]:
+            entry[field] = record["extra"][field]
+    if record["exception"]:
+        entry["exception"] = repr(record["exception"].value)
+    record["extra"]["json"] = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+    return True
+
+
+def add_logger(
+        log_output: str = LOG_OUTPUT,
+        log_rotation: str = LOG_ROTATION,
+        enqueue: bool = False,
+        json_output: str = ""
+):
     logger.remove()
 
     logger.add(
         stderr,
+        level=LOG_LEVEL,
         format="<bold><blue>{time:HH:mm:ss}</blue> | "
                "<level>{extra[icon]}</level> | "
                "<level>{message}</level></bold>",
-        filter=lambda record: record.update(extra={
-            "icon": {
-                "SUCCESS": "[+]",
-                "INFO": "[•]",
-                "WARNING": "[!]",
-                "ERROR": "[-]",
-                "BLUE": "[•]",
-                "YELLOW": "[•]",
-                "CYAN": "[•]",
-                "MAGENTA": "[•]",
-            }.get(record["level"].name, record["level"].name)
-        }) or True
+        filter=_add_icon,
+        enqueue=enqueue
     )
-    logger.add(sink=log_output, rotation=log_rotation)
+    logger.add(sink=log_output, level=LOG_LEVEL, rotation=log_rotation, enqueue=enqueue)
+    if json_output:
+        logger.add(
+            sink=json_output,
+            level="DEBUG",
+            format=lambda record: "{extra[json]}\n",
+            filter=_add_json,
+            rotation=log_rotation,
+            enqueue=enqueue
+        )
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+from collections import deque
+
+from loguru import logger
+
+from user_data import config
+
+WINDOW_FIELDS = ('attestations_succeeded', 'attestations_missed', 'blocks_mined', 'blocks_missed')
+
+
+def attestation_counts(row: dict, window_min: int) -> tuple[int, int, bool]:
+    succeeded = row.get('window_attestations_succeeded') or 0
+    total = succeeded + (row.get('window_attestations_missed') or 0)
+    if total >= window_min:
+        return succeeded, total, True
+
+    succeeded = row.get('attestations_succeeded') or 0
+    return succeeded, succeeded + (row.get('attestations_missed') or 0), False
+
+
+class AttestationWindows:
+    def __init__(self):
+        self.buffers: dict[str, deque] = {}
+        self.path = ''
+        self._lock = threading.Lock()
+
+    def update(self, address: str, timestamp: float, counters: tuple[int, int, int, int]) -> dict:
+        with self._lock:
+            buffer = self.buffers.get(address)
+            if buffer is None or buffer.maxlen != config.attestation_window_slots:
+                buffer = self.buffers[address] = deque(buffer or (), maxlen=config.attestation_window_slots)
+
+            if buffer and any(value < previous for value, previous in zip(counters, buffer[-1][1:])):
+                buffer.clear()
+            if not buffer or tuple(buffer[-1][1:]) != counters:
+                buffer.append((timestamp, *counters))
+
+            window_start = timestamp - config.attestation_window
+            while len(buffer) >= 2 and buffer[1][0] <= window_start:
+                buffer.popleft()
+
+            baseline = buffer[0]
+            return {
+                f"window_{field}": value - baseline[index]
+                for index, (field, value) in enumerate(zip(WINDOW_FIELDS, counters), start=1)
+            }
+
+    def forget(self, address: str):
+        with self._lock:
+            self.buffers.pop(address, None)
+
+    def load(self, path: str):
+        self.path = path
+        if not path or not os.path.exists(path):
+            return
+
+        try:
+            with open(path) as file:
+                buffers = json.load(file)
+        except Exception as e:
+            logger.warning(f"[window] can't load {path}, starting with empty windows: {e}")
+            return
+
+        with self._lock:
+            self.buffers = {
+                address: deque((tuple(snapshot) for snapshot in snapshots), maxlen=config.attestation_window_slots)
+                for address, snapshots in buffers.items()
+            }
+        logger.info(f"[window] loaded attestation windows of {len(self.buffers)} validator(s).")
+
+    def save(self):
+        if not self.path:
+            return
+
+        with self._lock:
+            buffers = {address: list(buffer) for address, buffer in self.buffers.items()}
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.tmp", 'w') as file:
+            json.dump(buffers, file, separators=(',', ':'))
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+attestation_windows = AttestationWindows()
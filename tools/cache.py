@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class _Fetch:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+class TTLCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: dict[Hashable, tuple[Any, float]] = {}
+        self._fetches: dict[Hashable, _Fetch] = {}
+        self._lock = threading.Lock()
+
+    def peek(self, key: Hashable) -> tuple[Any, float] | None:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+
+        age = time.monotonic() - entry[1]
+        if age >= self.ttl:
+            return None
+        return entry[0], age
+
+    def set(self, key: Hashable, value: Any):
+        self._values[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Hashable):
+        self._values.pop(key, None)
+
+    def get(self, key: Hashable, fetch: Callable[[], Any]) -> tuple[Any, float]:
+        cached = self.peek(key)
+        if cached:
+            return cached
+
+        with self._lock:
+            cached = self.peek(key)
+            if cached:
+                return cached
+
+            in_flight = self._fetches.get(key)
+            owner = in_flight is None
+            if owner:
+                in_flight = self._fetches[key] = _Fetch()
+
+        if not owner:
+            in_flight.done.wait()
+            return in_flight.value, 0.0
+
+        try:
+            in_flight.value = fetch()
+            if in_flight.value:
+                self.set(key, in_flight.value)
+        finally:
+            with self._lock:
+                self._fetches.pop(key, None)
+            in_flight.done.set()
+
+        return in_flight.value, 0.0
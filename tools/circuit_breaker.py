@@ -0,0 +1,100 @@
+import threading
+import time
+
+from loguru import logger
+
+from user_data import config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+                return
+            raise CircuitOpenError(f"circuit open for {self.host}")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def _set_state(self, state: str):
+        if state == OPEN:
+            logger.warning(f"[circuit] {self.host}: {self.state} -> {state} after {self.failures} failure(s).")
+        else:
+            logger.info(f"[circuit] {self.host}: {self.state} -> {state}.")
+        self.state = state
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+# breakers scoped as "<scope>/<host>" (one per pooled proxy) grouped by host
+_scoped: dict[str, list[CircuitBreaker]] = {}
+_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker:
+        return breaker
+
+    with _lock:
+        if host in _breakers:
+            return _breakers[host]
+        breaker = _breakers[host] = CircuitBreaker(
+            host=host,
+            failure_threshold=config.breaker_failure_threshold,
+            reset_timeout=config.breaker_reset_timeout
+        )
+        if '/' in host:
+            _scoped.setdefault(host.rsplit('/', 1)[1], []).append(breaker)
+        return breaker
+
+
+def reconfigure_breakers():
+    with _lock:
+        for breaker in _breakers.values():
+            breaker.failure_threshold = config.breaker_failure_threshold
+            breaker.reset_timeout = config.breaker_reset_timeout
+
+
+def breaker_summary(hosts: list[str]) -> str:
+    states = []
+    for host in hosts:
+        breaker = _breakers.get(host)
+        if breaker and breaker.state != CLOSED:
+            states.append(f"{host}={breaker.state}")
+
+        scoped = _scoped.get(host, [])
+        not_closed = [breaker for breaker in scoped if breaker.state != CLOSED]
+        if not_closed:
+            state = OPEN if any(breaker.state == OPEN for breaker in not_closed) else HALF_OPEN
+            states.append(f"{host}={state} on {len(not_closed)}/{len(scoped)} proxies")
+    return ';'.join(states)
@@ -0,0 +1,74 @@
+from datatypes.csv_account import CsvAccount
+from datatypes.records import (
+    AccountRecord,
+    BlockRecord,
+    DashtecRecord,
+    LatestBlockRecord,
+    LatestBlockResultRecord,
+    TelegramRecord,
+)
+from datatypes.responses.dashtec import DashtecResponse
+from datatypes.responses.latest_block import LatestBlockResponse
+from datatypes.responses.telegram import TelegramResponse
+from user_data import config
+
+DASHTEC_INT_FIELDS = (
+    'balance', 'unclaimedRewards',
+    'totalAttestationsSucceeded', 'totalAttestationsMissed',
+    'totalBlocksProposed', 'totalBlocksMined', 'totalBlocksMissed',
+)
+
+
+def _int_or_none(value) -> int | None:
+    return None if value is None else int(value)
+
+
+def _block(r: dict) -> BlockRecord:
+    return BlockRecord(number=int(r['number']), hash=r['hash'])
+
+
+def decode_latest_block(r: dict) -> LatestBlockResponse | LatestBlockRecord:
+    if config.strict_decoding:
+        return LatestBlockResponse(**r)
+
+    result = r['result']
+    return LatestBlockRecord(
+        jsonrpc=r['jsonrpc'],
+        id=int(r['id']),
+        result=LatestBlockResultRecord(
+            latest=_block(result['latest']),
+            proven=_block(result['proven']),
+            finalized=_block(result['finalized'])
+        )
+    )
+
+
+def decode_dashtec(r: dict) -> DashtecResponse | DashtecRecord:
+    if config.strict_decoding:
+        return DashtecResponse(**r)
+
+    attestation_success = r.get('attestationSuccess')
+    return DashtecRecord(
+        status=str(r['status']),
+        attestationSuccess=None if attestation_success is None else str(attestation_success),
+        **{field: _int_or_none(r.get(field)) for field in DASHTEC_INT_FIELDS}
+    )
+
+
+def decode_telegram(r: dict) -> TelegramResponse | TelegramRecord:
+    if config.strict_decoding:
+        return TelegramResponse.parse_obj(r)
+
+    return TelegramRecord(
+        ok=bool(r['ok']),
+        error_code=_int_or_none(r.get('error_code')),
+        description=r.get('description'),
+        parameters=r.get('parameters')
+    )
+
+
+def decode_account(row: dict) -> CsvAccount | AccountRecord:
+    if config.strict_decoding:
+        return CsvAccount(id=int(row['id']), address=row['address'], ip=row['ip'], port=row['port'], note=row['note'])
+
+    return AccountRecord(id=int(row['id']), address=row['address'], ip=row['ip'], port=int(row['port']), note=row['note'])
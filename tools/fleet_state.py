@@ -0,0 +1,50 @@
+import threading
+import time
+
+from datatypes.csv_account import CsvAccount
+
+
+class FleetState:
+    def __init__(self, accs: list[CsvAccount]):
+        self.accounts: dict[int, CsvAccount] = {acc.id: acc for acc in accs}
+        self.liveness: dict[int, dict] = {}
+        self.stats: dict[int, dict] = {}
+        self.updated_at: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def set_accounts(self, accs: list[CsvAccount]):
+        with self._lock:
+            self.accounts = {acc.id: acc for acc in accs}
+            for acc_id in [acc_id for acc_id in self.updated_at if acc_id not in self.accounts]:
+                self.liveness.pop(acc_id, None)
+                self.stats.pop(acc_id, None)
+                self.updated_at.pop(acc_id, None)
+
+    def get_accounts(self) -> list[CsvAccount]:
+        with self._lock:
+            return list(self.accounts.values())
+
+    def get_liveness(self, acc_id: int) -> dict:
+        with self._lock:
+            return dict(self.liveness.get(acc_id, {}))
+
+    def update_liveness(self, acc_id: int, report: dict):
+        with self._lock:
+            if acc_id in self.accounts:
+                self.liveness[acc_id] = report
+                self.updated_at[acc_id] = time.time()
+
+    def update_stats(self, acc_id: int, report: dict):
+        with self._lock:
+            if acc_id in self.accounts:
+                self.stats[acc_id] = report
+                self.updated_at[acc_id] = time.time()
+
+    def data(self, acc_id: int) -> dict:
+        with self._lock:
+            liveness = self.liveness.get(acc_id, {})
+            stats = self.stats.get(acc_id, {})
+        return {**stats, **liveness, 'status': liveness.get('status') or stats.get('status', '')}
+
+    def snapshot(self) -> list[tuple[CsvAccount, dict]]:
+        return [(acc, self.data(acc_id=acc.id)) for acc in self.get_accounts() if acc.id in self.updated_at]
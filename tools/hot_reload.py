@@ -0,0 +1,148 @@
+import os
+import time
+from types import ModuleType
+
+from loguru import logger
+
+from datatypes.csv_account import CsvAccount
+from tools.circuit_breaker import reconfigure_breakers
+from tools.read_file import read_csv
+from user_data import config
+
+NUMERIC_TYPES = (int, float)
+
+
+class FileWatcher:
+    def __init__(self, path: str):
+        self.path = path
+        self.signature = self._signature()
+
+    def changed(self) -> bool:
+        signature = self._signature()
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        return True
+
+    def _signature(self) -> tuple | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+def _settings(namespace: dict) -> dict:
+    return {
+        key: value for key, value in namespace.items()
+        if not key.startswith('_') and not isinstance(value, ModuleType) and not callable(value)
+    }
+
+
+def _compatible(old, new) -> bool:
+    if old is None or new is None:
+        return True
+    if isinstance(old, bool) or isinstance(new, bool):
+        return isinstance(old, bool) and isinstance(new, bool)
+    if isinstance(old, NUMERIC_TYPES) and isinstance(new, NUMERIC_TYPES):
+        return True
+    return isinstance(new, type(old))
+
+
+def load_config(path: str) -> dict:
+    namespace = {}
+    with open(path) as file:
+        exec(compile(file.read(), path, 'exec'), namespace)
+
+    current = _settings(config.__dict__)
+    settings = _settings(namespace)
+    missing = [key for key in current if key not in settings]
+    if missing:
+        raise Exception(f"missing setting(s): {', '.join(missing)}")
+
+    invalid = [key for key, value in current.items() if not _compatible(value, settings[key])]
+    if invalid:
+        raise Exception(f"unexpected type of setting(s): {', '.join(invalid)}")
+    return settings
+
+
+class AccountsDiff:
+    def __init__(
+            self,
+            accs: list[CsvAccount],
+            added: list[CsvAccount],
+            removed: list[CsvAccount],
+            updated: list[tuple[CsvAccount, CsvAccount]]
+    ):
+        self.accs = accs
+        self.added = added
+        self.removed = removed
+        self.updated = updated
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.updated)
+
+
+class HotReloader:
+    def __init__(self, accounts_path: str, config_path: str = config.__file__):
+        self.accounts = FileWatcher(path=accounts_path)
+        self.config = FileWatcher(path=config_path)
+        self.checked_at = time.monotonic()
+
+    def poll(self, accs: list[CsvAccount] | None) -> AccountsDiff | None:
+        if not config.hot_reload_interval or time.monotonic() - self.checked_at < config.hot_reload_interval:
+            return None
+        self.checked_at = time.monotonic()
+
+        if self.config.changed():
+            self.reload_config()
+        if accs is not None and self.accounts.changed():
+            return self.reload_accounts(accs=accs)
+        return None
+
+    def reload_config(self):
+        try:
+            settings = load_config(path=self.config.path)
+        except Exception as e:
+            logger.error(f"[reload] {self.config.path} rejected, keeping the last good config: {e}")
+            return
+
+        changed = [key for key, value in settings.items() if config.__dict__.get(key) != value]
+        config.__dict__.update(settings)
+        if {'breaker_failure_threshold', 'breaker_reset_timeout'} & set(changed):
+            reconfigure_breakers()
+        if changed:
+            logger.info(f"[reload] config reloaded, changed: {', '.join(changed)}.")
+
+    def reload_accounts(self, accs: list[CsvAccount]) -> AccountsDiff | None:
+        try:
+            new_accs = read_csv(self.accounts.path)
+        except Exception as e:
+            logger.error(f"[reload] {self.accounts.path} rejected, keeping {len(accs)} account(s): {e}")
+            return None
+
+        ids = [acc.id for acc in new_accs]
+        if len(ids) != len(set(ids)):
+            logger.error(f"[reload] {self.accounts.path} rejected, keeping {len(accs)} account(s): duplicate ids.")
+            return None
+
+        addresses = [acc.address.lower() for acc in new_accs]
+        if len(addresses) != len(set(addresses)):
+            logger.error(
+                f"[reload] {self.accounts.path} rejected, keeping {len(accs)} account(s): duplicate addresses."
+            )
+            return None
+
+        old = {acc.address.lower(): acc for acc in accs}
+        new = dict(zip(addresses, new_accs))
+        diff = AccountsDiff(
+            accs=new_accs,
+            added=[acc for address, acc in new.items() if address not in old],
+            removed=[acc for address, acc in old.items() if address not in new],
+            updated=[(old[address], acc) for address, acc in new.items() if address in old and old[address] != acc]
+        )
+        logger.info(
+            f"[reload] accounts reloaded: {len(diff.added)} added, {len(diff.removed)} removed, "
+            f"{len(diff.updated)} updated, {len(new_accs)} in total."
+        )
+        return diff
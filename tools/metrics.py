@@ -0,0 +1,216 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+VALIDATOR_GAUGES = {
+    'sync_latest': 'latest L2 block of the validator node',
+    'explorer_height': 'explorer L2 height used for the sync check',
+    'reference_height': 'reference L2 height from the fleet tips and the explorer',
+    'sync_lag': 'blocks the validator node is behind the reference height',
+    'balance': 'validator balance in STK',
+    'rewards': 'unclaimed rewards in STK',
+    'attestations_missed': 'total missed attestations',
+    'attestations_succeeded': 'total succeeded attestations',
+    'attestation_success_rate': 'attestation success rate in percent',
+    'block_missed': 'total missed blocks',
+    'block_mined': 'total mined blocks',
+    'block_proposed': 'total proposed blocks',
+    'window_attestations_missed': 'missed attestations within attestation_window',
+    'window_attestations_succeeded': 'succeeded attestations within attestation_window',
+    'window_blocks_missed': 'missed blocks within attestation_window',
+    'window_blocks_mined': 'mined blocks within attestation_window',
+}
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.help: dict[str, tuple[str, str]] = {}
+        self.values: dict[str, dict[tuple, float | Histogram]] = {}
+        self.validator_statuses: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._snapshot = b''
+        self._dirty = True
+
+    def describe(self, name: str, metric_type: str, description: str):
+        self.help.setdefault(name, (metric_type, description))
+        self.values.setdefault(name, {})
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.values[name][_labels(labels)] = value
+            self._dirty = True
+
+    def inc_counter(self, name: str, value: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            self.values[name][key] = self.values[name].get(key, 0) + value
+            self._dirty = True
+
+    def observe(self, name: str, value: float, **labels):
+        key = _labels(labels)
+        with self._lock:
+            histogram = self.values[name].get(key)
+            if histogram is None:
+                histogram = self.values[name][key] = Histogram(buckets=LATENCY_BUCKETS)
+            histogram.observe(value)
+            self._dirty = True
+
+    def update_validator(self, row: dict):
+        labels = {'id': row['id'], 'address': row['address'], 'ip': row['ip']}
+        sync_latest = row.get('sync_latest') or 0
+        reference_height = row.get('reference_height') or row.get('explorer_height') or 0
+        missed = row.get('attestations_missed') or 0
+        succeeded = row.get('attestations_succeeded') or 0
+
+        values = {field: row.get(field) or 0 for field in VALIDATOR_GAUGES if field in row}
+        values['sync_lag'] = max(reference_height - sync_latest, 0) if sync_latest and reference_height else 0
+        values['attestation_success_rate'] = round(succeeded / (missed + succeeded) * 100, 2) if missed + succeeded else 0
+
+        with self._lock:
+            key = _labels(labels)
+            for field, value in values.items():
+                self.values[f"aztec_validator_{field}"][key] = value
+
+            status_key = _labels({**labels, 'status': row.get('status') or 'unknown'})
+            previous_key = self.validator_statuses.get(str(row['id']))
+            if previous_key and previous_key != status_key:
+                self.values['aztec_validator_status'].pop(previous_key, None)
+            self.values['aztec_validator_status'][status_key] = 1
+            self.validator_statuses[str(row['id'])] = status_key
+            self._dirty = True
+
+    def remove_validator(self, acc_id: int):
+        with self._lock:
+            for name in self.values:
+                if name.startswith('aztec_validator_'):
+                    for key in [key for key in self.values[name] if ('id', str(acc_id)) in key]:
+                        del self.values[name][key]
+            self.validator_statuses.pop(str(acc_id), None)
+            self._dirty = True
+
+    def collect_deltas(self) -> dict[str, tuple[str, dict]]:
+        # monitor series recorded since the previous call: gauges as values, counters and histograms as deltas
+        with self._lock:
+            deltas = {}
+            for name, (metric_type, _) in self.help.items():
+                if name.startswith('aztec_validator_') or not self.values[name]:
+                    continue
+                deltas[name] = (metric_type, dict(self.values[name]))
+                if metric_type != 'gauge':
+                    self.values[name] = {}
+            return deltas
+
+    def merge(self, deltas: dict[str, tuple[str, dict]], skip: set[str] = frozenset(), **labels):
+        extra = _labels(labels)
+        with self._lock:
+            for name, (metric_type, series) in deltas.items():
+                if name in skip or name not in self.values:
+                    continue
+                for key, value in series.items():
+                    if metric_type == 'gauge':
+                        self.values[name][tuple(sorted(key + extra))] = value
+                    elif metric_type == 'histogram':
+                        histogram = self.values[name].get(key)
+                        if histogram is None:
+                            histogram = self.values[name][key] = Histogram(buckets=value.buckets)
+                        histogram.counts = [total + count for total, count in zip(histogram.counts, value.counts)]
+                        histogram.sum += value.sum
+                        histogram.count += value.count
+                    else:
+                        self.values[name][key] = self.values[name].get(key, 0) + value
+            self._dirty = True
+
+    def render(self) -> bytes:
+        with self._lock:
+            if not self._dirty:
+                return self._snapshot
+
+            lines = []
+            for name, (metric_type, description) in self.help.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, value in self.values[name].items():
+                    if isinstance(value, Histogram):
+                        cumulative = 0
+                        for bound, count in zip(value.buckets + ('+Inf',), value.counts):
+                            cumulative += count
+                            lines.append(f"{name}_bucket{_format_labels(key, (('le', str(bound)),))} {cumulative}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {value.sum}")
+                        lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+                    else:
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+
+            self._snapshot = ('\n'.join(lines) + '\n').encode()
+            self._dirty = False
+            return self._snapshot
+
+
+metrics = MetricsRegistry()
+for _field, _description in VALIDATOR_GAUGES.items():
+    metrics.describe(f"aztec_validator_{_field}", "gauge", _description)
+metrics.describe("aztec_validator_status", "gauge", "current validator status, 1 for the active status label")
+metrics.describe("aztec_monitor_cycle_duration_seconds", "gauge", "wall time of the last monitoring cycle")
+metrics.describe("aztec_monitor_liveness_duration_seconds", "gauge", "wall time of the last liveness pass in tiered mode")
+metrics.describe("aztec_monitor_cycles_total", "counter", "completed monitoring cycles")
+metrics.describe("aztec_monitor_checked_validators", "gauge", "validators checked in the last cycle")
+metrics.describe("aztec_monitor_request_duration_seconds", "histogram", "request latency per upstream")
+metrics.describe("aztec_monitor_requests_total", "counter", "requests per upstream and outcome")
+metrics.describe("aztec_monitor_retries_total", "counter", "retry attempts per module")
+metrics.describe("aztec_monitor_proxy_health", "gauge", "proxy health score from 0 to 1")
+metrics.describe("aztec_monitor_proxy_evicted", "gauge", "1 while the proxy is evicted from the pool")
+metrics.describe("aztec_monitor_proxy_requests_total", "counter", "external requests per proxy and outcome")
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = metrics.render()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"metrics are served on http://{host}:{port}/metrics")
+    return server
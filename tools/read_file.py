@@ -2,6 +2,7 @@ import csv
 from typing import List
 
 from datatypes.csv_account import CsvAccount
+from tools.decoder import decode_account
 
 
 def read_file(path: str):
@@ -19,12 +20,5 @@ def read_csv(csv_path: str) -> List[CsvAccount]:
     with open(csv_path, 'r') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            account = CsvAccount(
-                id=int(row['id']),
-                address=row['address'],
-                ip=row['ip'],
-                port=row['port'],
-                note=row['note'],
-            )
-            accounts.append(account)
+            accounts.append(decode_account(row))
     return accounts
@@ -0,0 +1,67 @@
+import threading
+import time
+from statistics import median
+
+from user_data import config
+
+
+def quantile(values: list[int], q: float) -> int:
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q * (len(values) - 1))))]
+
+
+def blocks_since(observed_at: float, now: float) -> int:
+    return int((now - observed_at) / config.reference_block_time) if config.reference_block_time else 0
+
+
+class ReferenceHeight:
+    def __init__(self):
+        self.tips: dict[str, tuple[float, int, int, int]] = {}
+        self.height = 0
+        self.estimated_at = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, node: str, latest: int, proven: int, finalized: int):
+        with self._lock:
+            self.tips[node] = (time.monotonic(), latest, proven, finalized)
+
+    def fleet_height(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            if self.height and now - self.estimated_at < config.explorer_cache_ttl:
+                return self.height + blocks_since(observed_at=self.estimated_at, now=now)
+
+            self.height = self._estimate(now=now)
+            self.estimated_at = now
+            return self.height
+
+    def _estimate(self, now: float) -> int:
+        for node in [node for node, tip in self.tips.items() if now - tip[0] > config.reference_max_age]:
+            del self.tips[node]
+        if len(self.tips) < config.reference_min_nodes:
+            return 0
+
+        tips = []
+        for observed_at, latest, _, finalized in self.tips.values():
+            shift = blocks_since(observed_at=observed_at, now=now)
+            tips.append((latest + shift, finalized + shift))
+        latest_median = median(tip[0] for tip in tips)
+        finalized_median = median(tip[1] for tip in tips)
+        inliers = [
+            latest for latest, _ in tips
+            if latest >= finalized_median and abs(latest - latest_median) <= config.reference_outlier_blocks
+        ]
+        if len(inliers) < config.reference_min_nodes:
+            return 0
+        return quantile(inliers, config.reference_quantile)
+
+    def estimate(self, explorer_height: int) -> tuple[int, str]:
+        fleet_height = self.fleet_height() if config.reference_source != "explorer" else 0
+        if fleet_height and fleet_height >= explorer_height:
+            return fleet_height, "fleet"
+        if explorer_height:
+            return explorer_height, "explorer"
+        return 0, ""
+
+
+reference_height = ReferenceHeight()
@@ -0,0 +1,345 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import zipfile
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from typing import Iterator
+
+REPORTS_DIR = "user_data/reports"
+ARCHIVE_DIR = "archive"
+REPORT_TIME_FORMAT = "%Y%m%d-%H%M%S"
+INDEX_MEMBER = "index.json"
+ESCAPES = re.compile(r'\\(.)')
+
+
+def report_time(name: str) -> datetime | None:
+    try:
+        return datetime.strptime(name.split('.', 1)[0], REPORT_TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def list_reports(reports_dir: str) -> list[tuple[datetime, str]]:
+    reports = []
+    for name in os.listdir(reports_dir):
+        timestamp = report_time(name)
+        if timestamp and (name.endswith('.csv') or name.endswith('.csv.gz')):
+            reports.append((timestamp, os.path.join(reports_dir, name)))
+    return sorted(reports)
+
+
+def read_report(path: str) -> Iterator[dict]:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+
+def _escape(value) -> str:
+    return str(value if value is not None else '').replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _unescape(value: str) -> str:
+    return ESCAPES.sub(lambda match: '\n' if match.group(1) == 'n' else match.group(1), value) if '\\' in value else value
+
+
+class DayArchive:
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def index(self) -> dict:
+        with zipfile.ZipFile(self.path) as archive:
+            return json.loads(archive.read(INDEX_MEMBER))
+
+    def rows(self, fields: list[str] = None, address: str = None) -> Iterator[dict]:
+        with zipfile.ZipFile(self.path) as archive:
+            index = json.loads(archive.read(INDEX_MEMBER))
+            if address and address not in index['addresses']:
+                return
+
+            fields = [field for field in (fields or index['fieldnames']) if field in index['fieldnames']]
+            columns = list(dict.fromkeys(['timestamp', 'address', *fields]))
+            with ExitStack() as stack:
+                streams = [
+                    io.TextIOWrapper(
+                        stack.enter_context(archive.open(f"columns/{column}")), encoding='utf-8', newline='\n'
+                    )
+                    for column in columns
+                ]
+                for values in zip(*streams):
+                    row = {column: _unescape(value[:-1]) for column, value in zip(columns, values)}
+                    if address and row['address'] != address:
+                        continue
+                    row['timestamp'] = int(row['timestamp'])
+                    yield row
+
+    def write(self, reports: list[tuple[datetime, str]], fieldnames: list[str]):
+        addresses = Counter()
+        cycles = []
+        rows = 0
+        start = end = None
+
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(self.path) or '.') as spool_dir, ExitStack() as stack:
+            columns = ['timestamp', *fieldnames]
+            spools = {
+                column: stack.enter_context(open(os.path.join(spool_dir, column), 'w', encoding='utf-8', newline='\n'))
+                for column in columns
+            }
+
+            def spool(timestamp: int, report_rows: Iterator[dict]):
+                nonlocal rows, start, end
+                first_row = rows
+                for row in report_rows:
+                    spools['timestamp'].write(f"{timestamp}\n")
+                    for field in fieldnames:
+                        spools[field].write(_escape(row.get(field)) + '\n')
+                    addresses[row.get('address', '')] += 1
+                    rows += 1
+                if rows > first_row:
+                    cycles.append([timestamp, first_row, rows - first_row])
+                    start = timestamp if start is None else min(start, timestamp)
+                    end = timestamp if end is None else max(end, timestamp)
+
+            if self.exists():
+                current_timestamp = None
+                buffered = []
+                for row in self.rows():
+                    if row['timestamp'] != current_timestamp and buffered:
+                        spool(timestamp=current_timestamp, report_rows=iter(buffered))
+                        buffered = []
+                    current_timestamp = row['timestamp']
+                    buffered.append(row)
+                if buffered:
+                    spool(timestamp=current_timestamp, report_rows=iter(buffered))
+
+            for timestamp, path in reports:
+                spool(timestamp=int(timestamp.timestamp()), report_rows=read_report(path))
+
+            for spool_file in spools.values():
+                spool_file.close()
+
+            index = {
+                'fieldnames': fieldnames,
+                'rows': rows,
+                'start': start,
+                'end': end,
+                'cycles': cycles,
+                'addresses': addresses,
+            }
+            tmp_path = f"{self.path}.tmp"
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+                archive.writestr(INDEX_MEMBER, json.dumps(index, separators=(',', ':')))
+                for column in columns:
+                    archive.write(os.path.join(spool_dir, column), arcname=f"columns/{column}")
+            os.replace(tmp_path, self.path)
+        return rows
+
+
+def compact(reports_dir: str, older_than_days: int, keep: bool) -> int:
+    archive_dir = os.path.join(reports_dir, ARCHIVE_DIR)
+    os.makedirs(archive_dir, exist_ok=True)
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).strftime('%Y%m%d')
+
+    days: dict[str, list[tuple[datetime, str]]] = {}
+    for timestamp, path in list_reports(reports_dir):
+        day = timestamp.strftime('%Y%m%d')
+        if day < cutoff:
+            days.setdefault(day, []).append((timestamp, path))
+
+    compacted = 0
+    for day, reports in sorted(days.items()):
+        fieldnames = []
+        for _, path in reports:
+            with (gzip.open if path.endswith('.gz') else open)(path, 'rt', newline='', encoding='utf-8') as file:
+                header = next(csv.reader(file), [])
+            fieldnames.extend(field for field in header if field not in fieldnames)
+
+        archive = DayArchive(path=os.path.join(archive_dir, f"{day}.zip"))
+        packed = reports
+        if archive.exists():
+            index = archive.index()
+            fieldnames = list(dict.fromkeys([*index['fieldnames'], *fieldnames]))
+            archived = {cycle[0] for cycle in index['cycles']}
+            packed = [(timestamp, path) for timestamp, path in reports if int(timestamp.timestamp()) not in archived]
+
+        rows = archive.write(reports=packed, fieldnames=fieldnames) if packed else archive.index()['rows']
+        if not keep:
+            for _, path in reports:
+                os.remove(path)
+        compacted += len(packed)
+        print(
+            f"{day}: {len(packed)} report(s) packed, {len(reports) - len(packed)} already archived, "
+            f"{rows} row(s) in {archive.path}",
+            file=sys.stderr
+        )
+    return compacted
+
+
+def iter_rows(
+        reports_dir: str,
+        fields: list[str] = None,
+        address: str = None,
+        since: datetime = None,
+        until: datetime = None
+) -> Iterator[dict]:
+    since_ts = int(since.timestamp()) if since else None
+    until_ts = int(until.timestamp()) if until else None
+
+    def in_range(timestamp: int) -> bool:
+        return (since_ts is None or timestamp >= since_ts) and (until_ts is None or timestamp < until_ts)
+
+    archive_dir = os.path.join(reports_dir, ARCHIVE_DIR)
+    archives = sorted(os.listdir(archive_dir)) if os.path.isdir(archive_dir) else []
+    archived = set()
+    for name in archives:
+        if not name.endswith('.zip'):
+            continue
+        day = name[:-4]
+        if (since and day < since.strftime('%Y%m%d')) or (until and day > until.strftime('%Y%m%d')):
+            continue
+        archive = DayArchive(path=os.path.join(archive_dir, name))
+        archived.update(cycle[0] for cycle in archive.index()['cycles'])
+        for row in archive.rows(fields=fields, address=address):
+            if in_range(row['timestamp']):
+                yield row
+
+    for timestamp, path in list_reports(reports_dir):
+        report_ts = int(timestamp.timestamp())
+        # reports kept after 'compact --keep' are already in the archive
+        if not in_range(report_ts) or report_ts in archived:
+            continue
+        for row in read_report(path):
+            if address and row.get('address') != address:
+                continue
+            yield {
+                'timestamp': report_ts,
+                'address': row.get('address', ''),
+                **{field: row.get(field, '') for field in (fields or row)}
+            }
+
+
+def _number(value: str) -> float | None:
+    try:
+        return float(value.rstrip('%'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def query_series(rows: Iterator[dict], fields: list[str], output):
+    writer = csv.writer(output)
+    writer.writerow(['time', 'address', *fields])
+    for row in rows:
+        writer.writerow([
+            datetime.fromtimestamp(row['timestamp']).isoformat(),
+            row['address'],
+            *[row.get(field, '') for field in fields]
+        ])
+
+
+def query_fleet(rows: Iterator[dict], fields: list[str], output):
+    writer = csv.writer(output)
+    writer.writerow(['time', 'validators', 'statuses', *[f"avg_{field}" for field in fields]])
+
+    def flush(timestamp: int, validators: int, statuses: Counter, sums: dict, counts: dict):
+        writer.writerow([
+            datetime.fromtimestamp(timestamp).isoformat(),
+            validators,
+            ';'.join(f"{status or 'unknown'}={count}" for status, count in statuses.most_common()),
+            *[round(sums[field] / counts[field], 4) if counts[field] else '' for field in fields]
+        ])
+
+    current = None
+    validators, statuses, sums, counts = 0, Counter(), dict.fromkeys(fields, 0.0), dict.fromkeys(fields, 0)
+    for row in rows:
+        if row['timestamp'] != current:
+            if current is not None:
+                flush(current, validators, statuses, sums, counts)
+            current = row['timestamp']
+            validators, statuses, sums, counts = 0, Counter(), dict.fromkeys(fields, 0.0), dict.fromkeys(fields, 0)
+
+        validators += 1
+        statuses[row.get('status', '')] += 1
+        for field in fields:
+            value = _number(row.get(field))
+            if value is not None:
+                sums[field] += value
+                counts[field] += 1
+
+    if current is not None:
+        flush(current, validators, statuses, sums, counts)
+
+
+def query_transitions(rows: Iterator[dict], output):
+    writer = csv.writer(output)
+    writer.writerow(['time', 'address', 'from', 'to'])
+    statuses: dict[str, str] = {}
+    for row in rows:
+        previous = statuses.get(row['address'])
+        status = row.get('status', '')
+        if previous is not None and previous != status:
+            writer.writerow([datetime.fromtimestamp(row['timestamp']).isoformat(), row['address'], previous, status])
+        statuses[row['address']] = status
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact and query the user_data/reports archive.")
+    parser.add_argument('--reports-dir', default=REPORTS_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compact_parser = commands.add_parser('compact', help="pack per-cycle CSV reports into daily column archives")
+    compact_parser.add_argument('--older-than-days', type=int, default=2, help="only pack days older than this")
+    compact_parser.add_argument('--keep', action='store_true', help="keep the packed CSV reports")
+
+    for command, description in [
+        ('series', "per-validator time series"),
+        ('fleet', "fleet-wide aggregates per cycle"),
+        ('transitions', "status transitions"),
+    ]:
+        query_parser = commands.add_parser(command, help=description)
+        query_parser.add_argument('--address', help="only this validator address")
+        query_parser.add_argument('--since', type=parse_time, help="ISO time, inclusive")
+        query_parser.add_argument('--until', type=parse_time, help="ISO time, exclusive")
+        if command != 'transitions':
+            query_parser.add_argument(
+                '--fields',
+                default='status,sync_latest,attestation_success' if command == 'series' else 'balance,sync_latest',
+                help="comma-separated report columns"
+            )
+
+    args = parser.parse_args()
+    if args.command == 'compact':
+        compact(reports_dir=args.reports_dir, older_than_days=args.older_than_days, keep=args.keep)
+        return
+
+    fields = args.fields.split(',') if args.command != 'transitions' else []
+    rows = iter_rows(
+        reports_dir=args.reports_dir,
+        fields=['status', *fields],
+        address=args.address,
+        since=args.since,
+        until=args.until
+    )
+    if args.command == 'series':
+        query_series(rows=rows, fields=fields, output=sys.stdout)
+    elif args.command == 'fleet':
+        query_fleet(rows=rows, fields=fields, output=sys.stdout)
+    else:
+        query_transitions(rows=rows, output=sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
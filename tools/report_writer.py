@@ -0,0 +1,98 @@
+import csv
+import gzip
+import json
+import os
+
+from local_data import constants
+
+BUFFER_SIZE = 1 << 16
+
+
+class CsvSink:
+    extension = 'csv'
+
+    def __init__(self, path: str, fieldnames: list[str]):
+        self.file = self.open(path)
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames)
+        self.writer.writeheader()
+
+    def open(self, path: str):
+        return open(path, 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE)
+
+    def write(self, row: dict):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class GzipCsvSink(CsvSink):
+    extension = 'csv.gz'
+
+    def open(self, path: str):
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+
+
+class JsonLinesSink:
+    extension = 'jsonl'
+
+    def __init__(self, path: str, fieldnames: list[str]):
+        self.fieldnames = fieldnames
+        self.file = open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+
+    def write(self, row: dict):
+        self.file.write(json.dumps({field: row.get(field) for field in self.fieldnames}) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+SINKS = {sink.extension: sink for sink in [CsvSink, GzipCsvSink, JsonLinesSink]}
+
+
+class ReportWriter:
+    def __init__(self, path: str, formats: list[str], fieldnames: list[str] = None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        unsupported = [report_format for report_format in formats if report_format not in SINKS]
+        if unsupported:
+            raise Exception(f"unsupported report format: {', '.join(unsupported)}")
+
+        fieldnames = fieldnames or constants.REPORT_FIELDNAMES
+        self.files = {}
+        self.sinks = []
+        try:
+            for report_format in formats:
+                final_path = f"{path}.{report_format}"
+                self.files[f"{final_path}.tmp"] = final_path
+                self.sinks.append(SINKS[report_format](path=f"{final_path}.tmp", fieldnames=fieldnames))
+        except Exception:
+            self.abort()
+            raise
+
+    def write(self, row: dict):
+        for sink in self.sinks:
+            sink.write(row)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+        for temp_path, final_path in self.files.items():
+            os.replace(temp_path, final_path)
+
+    def abort(self):
+        for sink in self.sinks:
+            sink.close()
+        for temp_path in self.files:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
@@ -1,31 +1,71 @@
 import functools
+import math
 import random
+import threading
 import time
 
 from loguru import logger
 
+from tools.circuit_breaker import CircuitOpenError
+from tools.metrics import metrics
+from tools.tracer import tracer
 from user_data import config
 
+_local = threading.local()
 
-def retry(module: str, max_retries: int = config.max_retries):
+
+def set_deadline(seconds: float):
+    _local.deadline = time.monotonic() + seconds
+
+
+def clear_deadline():
+    _local.deadline = None
+
+
+def remaining_time() -> float:
+    current_deadline = getattr(_local, 'deadline', None)
+    return math.inf if current_deadline is None else current_deadline - time.monotonic()
+
+
+def backoff_delay(attempt: int) -> float:
+    return random.uniform(0, min(config.retry_backoff_cap, config.retry_backoff_base * 2 ** attempt))
+
+
+def retry(module: str, max_retries: int = None):
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            attempts = 0
-            while attempts < max_retries:
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    attempts += 1
-                    try:
-                        logger.warning(f"#{kwargs['acc'].id} | [{module}] retry #{attempts}/{max_retries}. error: {e}")
-                    except:
-                        logger.warning(f"[{module}] retry #{attempts}/{max_retries}. error: {e}")
-
-                    time.sleep(random.randint(1, 5))
-
-            return False
+            if 'acc' in kwargs:
+                tracer.set_validator(kwargs['acc'].id)
+            with tracer.span(module):
+                return _call_with_retries(func, module, max_retries or config.max_retries, *args, **kwargs)
 
         return wrapper
 
     return decorator
+
+
+def _call_with_retries(func, module: str, max_retries: int, *args, **kwargs):
+    prefix = f"#{kwargs['acc'].id} | [{module}]" if 'acc' in kwargs else f"[{module}]"
+    attempts = 0
+    while attempts < max_retries:
+        try:
+            return func(*args, **kwargs)
+        except CircuitOpenError as e:
+            logger.warning(f"{prefix} {e}, skipped.")
+            return False
+        except Exception as e:
+            attempts += 1
+            metrics.inc_counter("aztec_monitor_retries_total", module=module)
+            logger.warning(f"{prefix} retry #{attempts}/{max_retries}. error: {e}")
+            if attempts >= max_retries:
+                break
+
+            delay = backoff_delay(attempt=attempts)
+            if remaining_time() < delay:
+                logger.warning(f"{prefix} deadline exceeded, giving up.")
+                break
+            with tracer.span(f"retry sleep: {module}"):
+                time.sleep(delay)
+
+    return False
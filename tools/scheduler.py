@@ -0,0 +1,78 @@
+import heapq
+import itertools
+import random
+import time
+
+from datatypes.csv_account import CsvAccount
+from tools.attestation_window import attestation_counts
+
+ALARM_STATUSES = {'connection_refused', 'synced_out', 'exiting', 'zombie', ''}
+
+
+def classify(row: dict, attestation_success_threshold: float, attestation_window_min: int) -> str:
+    status = row.get('status', '')
+    if status in ALARM_STATUSES:
+        return 'alarm'
+    if status.startswith('#') or status == 'not_registered':
+        return 'queued'
+
+    succeeded, total, _ = attestation_counts(row=row, window_min=attestation_window_min)
+    if total and succeeded / total * 100 < attestation_success_threshold:
+        return 'alarm'
+    return 'healthy'
+
+
+class AdaptiveScheduler:
+    def __init__(self, intervals: dict[str, float], jitter: float = 0.1):
+        self.intervals = intervals
+        self.jitter = jitter
+        self.accounts: dict[int, CsvAccount] = {}
+        self.due: dict[int, float] = {}
+        self._heap: list[tuple[float, int, int]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def add(self, acc: CsvAccount, due: float = None):
+        self.accounts[acc.id] = acc
+        self._push(acc_id=acc.id, due=time.monotonic() if due is None else due)
+
+    def remove(self, acc_id: int):
+        self.accounts.pop(acc_id, None)
+        self.due.pop(acc_id, None)
+
+    def replace(self, old: CsvAccount, new: CsvAccount):
+        self.accounts.pop(old.id, None)
+        self.accounts[new.id] = new
+        due = self.due.pop(old.id, None)
+        if due is not None:
+            self._push(acc_id=new.id, due=due)
+
+    def reschedule(self, acc_id: int, priority: str, now: float = None) -> float:
+        if acc_id not in self.accounts:
+            return 0
+
+        interval = self.intervals[priority] * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._push(acc_id=acc_id, due=(time.monotonic() if now is None else now) + interval)
+        return interval
+
+    def pop_due(self, now: float = None) -> list[CsvAccount]:
+        now = time.monotonic() if now is None else now
+        due_accs = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, acc_id = heapq.heappop(self._heap)
+            if self.due.get(acc_id) != due:
+                continue
+            del self.due[acc_id]
+            due_accs.append(self.accounts[acc_id])
+        return due_accs
+
+    def next_due(self) -> float | None:
+        while self._heap and self.due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _push(self, acc_id: int, due: float):
+        self.due[acc_id] = due
+        heapq.heappush(self._heap, (due, next(self._counter), acc_id))
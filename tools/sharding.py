@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Callable
+
+from loguru import logger
+
+from tools.metrics import metrics
+
+# set by the coordinator itself for the merged report
+COORDINATOR_METRICS = {'aztec_monitor_cycles_total', 'aztec_monitor_checked_validators'}
+
+
+def shard_for(address: str, shards: int) -> int:
+    return zlib.crc32(address.lower().encode()) % shards
+
+
+def watch_parent():
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+
+    def wait():
+        parent.join()
+        logger.warning(f"coordinator pid {parent.pid} is gone, exiting.")
+        os._exit(1)
+
+    threading.Thread(target=wait, name="parent-watch", daemon=True).start()
+
+
+class ShardAlarmSink:
+    def __init__(self, events: multiprocessing.Queue):
+        self.events = events
+
+    def send_alarm(
+            self,
+            head: str,
+            body: str,
+            dashtec: str,
+            sepoliascan: str,
+            validator: str = None,
+            alarm_type: str = None
+    ) -> bool:
+        self.events.put(('alarm', {
+            'head': head,
+            'body': body,
+            'dashtec': dashtec,
+            'sepoliascan': sepoliascan,
+            'validator': validator,
+            'alarm_type': alarm_type
+        }))
+        return True
+
+    def resolve(self, validator: str, alarm_types: set[str] = None):
+        self.events.put(('resolve', validator, alarm_types))
+
+    def close(self, timeout: float = 10):
+        pass
+
+
+class ShardCoordinator:
+    def __init__(
+            self,
+            worker: Callable,
+            shards: int,
+            telegram,
+            on_cycle: Callable[[list[dict]], None],
+            report_timeout: float,
+            restart_delay: float
+    ):
+        self.worker = worker
+        self.shards = shards
+        self.telegram = telegram
+        self.on_cycle = on_cycle
+        self.report_timeout = report_timeout
+        self.restart_delay = restart_delay
+        self.context = multiprocessing.get_context('spawn')
+        self.events = self.context.Queue()
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.started_at: dict[int, float] = {}
+        self.latest_rows: dict[int, list[dict]] = {}
+        self.pending: dict[int, list[dict]] = {}
+        self.pending_since = None
+
+    def start(self):
+        for shard in range(self.shards):
+            self._start_worker(shard=shard)
+
+    def stop(self, timeout: float = 10):
+        for process in self.processes.values():
+            process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=timeout)
+
+    def run(self):
+        self.start()
+        while True:
+            try:
+                event = self.events.get(timeout=1)
+            except queue.Empty:
+                event = None
+
+            if event:
+                self._handle(*event)
+            self._check_workers()
+
+            if self.pending and (
+                    len(self.pending) == self.shards or
+                    time.monotonic() - self.pending_since >= self.report_timeout
+            ):
+                self._flush()
+
+    def _handle(self, kind: str, *payload):
+        if kind == 'alarm':
+            self.telegram.send_alarm(**payload[0])
+        elif kind == 'resolve':
+            self.telegram.resolve(validator=payload[0], alarm_types=payload[1])
+        elif kind == 'metrics':
+            shard, deltas = payload
+            metrics.merge(deltas=deltas, skip=COORDINATOR_METRICS, shard=shard)
+        elif kind == 'cycle':
+            shard, rows = payload
+            if shard in self.pending:
+                self._flush()
+            if not self.pending:
+                self.pending_since = time.monotonic()
+            self.pending[shard] = rows
+            self.latest_rows[shard] = rows
+
+    def _flush(self):
+        missing = [shard for shard in range(self.shards) if shard not in self.pending]
+        if missing:
+            logger.warning(f"[shards] cycle report without fresh results from shard(s) {missing}, using previous ones.")
+
+        rows = []
+        for shard in range(self.shards):
+            rows.extend(self.pending.get(shard, self.latest_rows.get(shard, [])))
+        self.pending = {}
+
+        try:
+            self.on_cycle(sorted(rows, key=lambda row: row['id']))
+        except Exception as e:
+            logger.exception(e)
+
+    def _check_workers(self):
+        for shard, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            if time.monotonic() - self.started_at[shard] < self.restart_delay:
+                continue
+
+            logger.error(f"[shards] shard #{shard} exited with code {process.exitcode}, restarting.")
+            self._start_worker(shard=shard)
+
+    def _start_worker(self, shard: int):
+        process = self.context.Process(
+            target=self.worker,
+            kwargs={'shard': shard, 'shards': self.shards, 'events': self.events},
+            name=f"shard-{shard}",
+            daemon=True
+        )
+        process.start()
+        self.processes[shard] = process
+        self.started_at[shard] = time.monotonic()
+        logger.info(f"[shards] shard #{shard} started, pid {process.pid}.")
@@ -3,6 +3,8 @@ import time
 
 from loguru import logger
 
+from tools.tracer import tracer
+
 
 def sleep_in_range(sec_from: int, sec_to: int, acc_id: int = None, log: str = None):
     sleep_time = random.randint(sec_from, sec_to)
@@ -11,4 +13,5 @@ def sleep_in_range(sec_from: int, sec_to: int, acc_id: int = None, log: str = No
             logger.info(f"#{acc_id} | sleep {round(sleep_time, 2)} sec | {log}.")
         else:
             logger.info(f"sleep {round(sleep_time, 2)} sec | {log}.")
-    time.sleep(sleep_time)
+    with tracer.span("sleep"):
+        time.sleep(sleep_time)
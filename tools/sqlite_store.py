@@ -0,0 +1,152 @@
+import os
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+from local_data import constants
+
+COLUMN_TYPES = {
+    'id': 'INTEGER',
+    'port': 'INTEGER',
+    'sync_latest': 'INTEGER',
+    'explorer_age': 'REAL',
+    'reference_height': 'INTEGER',
+    'dashtec_age': 'REAL',
+    'balance': 'REAL',
+    'rewards': 'REAL',
+    'attestations_missed': 'INTEGER',
+    'attestations_succeeded': 'INTEGER',
+    'block_missed': 'INTEGER',
+    'block_mined': 'INTEGER',
+    'block_proposed': 'INTEGER',
+    'window_attestations_missed': 'INTEGER',
+    'window_attestations_succeeded': 'INTEGER',
+    'window_blocks_missed': 'INTEGER',
+    'window_blocks_mined': 'INTEGER',
+}
+AVERAGED_FIELDS = {'balance', 'rewards', 'explorer_age', 'dashtec_age'}
+HOUR = 3600
+DAY = 86400
+
+
+def check_retention(raw_retention_days: int, hourly_retention_days: int):
+    if raw_retention_days >= hourly_retention_days:
+        raise Exception(
+            f"sqlite_raw_retention_days ({raw_retention_days}) must be less than "
+            f"sqlite_hourly_retention_days ({hourly_retention_days})"
+        )
+
+
+class SqliteStore:
+    def __init__(self, path: str, downsample_interval: int = HOUR):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.downsample_interval = downsample_interval
+        self.last_downsample = 0
+        self.fields = [field for field in constants.REPORT_FIELDNAMES if field != 'address']
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS samples (timestamp INTEGER NOT NULL, address TEXT NOT NULL)"
+            )
+            for table in ['samples_hourly', 'samples_daily']:
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"bucket INTEGER NOT NULL, address TEXT NOT NULL, "
+                    f"last_timestamp INTEGER NOT NULL, samples INTEGER NOT NULL, "
+                    f"PRIMARY KEY (bucket, address))"
+                )
+
+            for table in ['samples', 'samples_hourly', 'samples_daily']:
+                existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+                for field in self.fields:
+                    if field not in existing:
+                        self.connection.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {field} {COLUMN_TYPES.get(field, 'TEXT')}"
+                        )
+
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS samples_address_timestamp ON samples (address, timestamp)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS samples_timestamp ON samples (timestamp)")
+
+    def write_cycle(self, timestamp: int, rows: list[dict]):
+        columns = ['timestamp', 'address'] + self.fields
+        query = f"INSERT INTO samples ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        values = [[timestamp, row['address']] + [row.get(field) for field in self.fields] for row in rows]
+
+        with self._lock, self.connection:
+            self.connection.executemany(query, values)
+
+    def downsample(self, raw_retention_days: int, hourly_retention_days: int, now: int = None):
+        now = now or int(time.time())
+        if now - self.last_downsample < self.downsample_interval:
+            return
+        self.last_downsample = now
+
+        try:
+            check_retention(raw_retention_days=raw_retention_days, hourly_retention_days=hourly_retention_days)
+        except Exception as e:
+            logger.error(f"sqlite: rollup skipped, {e}.")
+            return
+
+        raw_cutoff = (now - raw_retention_days * DAY) // HOUR * HOUR
+        hourly_cutoff = (now - hourly_retention_days * DAY) // DAY * DAY
+
+        with self._lock, self.connection:
+            rolled_raw = self._rollup(
+                source='samples',
+                target='samples_hourly',
+                bucket_size=HOUR,
+                timestamp_column='timestamp',
+                cutoff=raw_cutoff
+            )
+            rolled_hourly = self._rollup(
+                source='samples_hourly',
+                target='samples_daily',
+                bucket_size=DAY,
+                timestamp_column='bucket',
+                cutoff=hourly_cutoff
+            )
+
+        if rolled_raw or rolled_hourly:
+            logger.info(f"sqlite: rolled up {rolled_raw} raw and {rolled_hourly} hourly samples.")
+
+    def _rollup(self, source: str, target: str, bucket_size: int, timestamp_column: str, cutoff: int) -> int:
+        from_raw = source == 'samples'
+        last_timestamp = 'timestamp' if from_raw else 'last_timestamp'
+        samples = 'COUNT(*)' if from_raw else 'SUM(samples)'
+
+        # every column except the averaged ones is a bare column, sqlite takes it
+        # from the row that holds MAX(last_timestamp), i.e. the latest snapshot in the bucket
+        selected = []
+        for field in self.fields:
+            if field not in AVERAGED_FIELDS:
+                selected.append(field)
+            elif from_raw:
+                selected.append(f"AVG({field})")
+            else:
+                selected.append(f"SUM({field} * samples) / SUM(samples)")
+
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {target} "
+            f"(bucket, address, last_timestamp, samples, {', '.join(self.fields)}) "
+            f"SELECT {timestamp_column} / {bucket_size} * {bucket_size} AS bucket_start, address, "
+            f"MAX({last_timestamp}), {samples}, {', '.join(selected)} "
+            f"FROM {source} WHERE {timestamp_column} < ? GROUP BY bucket_start, address",
+            (cutoff,)
+        )
+        return self.connection.execute(f"DELETE FROM {source} WHERE {timestamp_column} < ?", (cutoff,)).rowcount
+
+    def close(self):
+        self.connection.close()
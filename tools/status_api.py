@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from loguru import logger
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+class FleetStatus:
+    def __init__(self):
+        self.validators: dict[int, tuple[bytes, str, str, int]] = {}
+        self.addresses: dict[str, int] = {}
+        self.version = 0
+        self._lock = threading.Lock()
+        self._views: dict[str | None, tuple[int, bytes]] = {}
+
+    def update(self, row: dict):
+        entry = {**row, 'checked_at': round(time.time(), 3)}
+        body = _dumps(entry)
+        address = str(row['address']).lower()
+        with self._lock:
+            self.version += 1
+            previous = self.validators.get(row['id'])
+            if previous and previous[2] != address and self.addresses.get(previous[2]) == row['id']:
+                del self.addresses[previous[2]]
+            self.validators[row['id']] = (body, str(row.get('status') or ''), address, self.version)
+            self.addresses[address] = row['id']
+
+    def remove(self, acc_id: int):
+        with self._lock:
+            entry = self.validators.pop(acc_id, None)
+            if entry:
+                self.addresses.pop(entry[2], None)
+                self.version += 1
+
+    def fleet(self, status: str = None) -> tuple[bytes, str]:
+        with self._lock:
+            cached = self._views.get(status)
+            if cached and cached[0] == self.version:
+                return cached[1], f'"{self.version}"'
+
+            bodies = [
+                body for _, (body, row_status, _, _) in sorted(self.validators.items())
+                if status is None or row_status == status
+            ]
+            payload = (
+                b'{"generated_at":' + _dumps(round(time.time(), 3)) +
+                b',"count":' + str(len(bodies)).encode() +
+                b',"validators":[' + b','.join(bodies) + b']}'
+            )
+            if len(self._views) > 64:
+                self._views.clear()
+            self._views[status] = (self.version, payload)
+            return payload, f'"{self.version}"'
+
+    def validator(self, key: str) -> tuple[bytes, str] | None:
+        with self._lock:
+            acc_id = int(key) if key.isdigit() else self.addresses.get(key.lower())
+            entry = self.validators.get(acc_id)
+            if not entry:
+                return None
+            return entry[0], f'"{entry[3]}"'
+
+
+fleet_status = FleetStatus()
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path.rstrip('/')
+        if path == '/fleet':
+            status = parse_qs(url.query).get('status', [None])[0]
+            response = fleet_status.fleet(status=status)
+        elif path.startswith('/validators/'):
+            response = fleet_status.validator(key=unquote(path[len('/validators/'):]))
+        else:
+            response = None
+
+        if response is None:
+            self.send_error(404)
+            return
+
+        body, etag = response
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_status_server(host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StatusHandler)
+    threading.Thread(target=server.serve_forever, name="status-server", daemon=True).start()
+    logger.info(f"fleet status is served on http://{host}:{port}/fleet")
+    return server
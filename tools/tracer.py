@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from loguru import logger
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'stage', 'validator', 'started')
+
+    def __init__(self, tracer: 'Tracer', stage: str, validator: int | None):
+        self.tracer = tracer
+        self.stage = stage
+        self.validator = validator
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.record(
+            stage=self.stage,
+            validator=self.validator,
+            started=self.started,
+            duration=time.perf_counter() - self.started,
+            failed=exc_type is not None
+        )
+        return False
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.spans: list[tuple] = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def set_validator(self, validator: int | None):
+        if self.enabled:
+            self._local.validator = validator
+
+    def span(self, stage: str) -> _Span | _NoopSpan:
+        if not self.enabled:
+            return NOOP_SPAN
+        return _Span(tracer=self, stage=stage, validator=getattr(self._local, 'validator', None))
+
+    def record(self, stage: str, validator: int | None, started: float, duration: float, failed: bool):
+        with self._lock:
+            self.spans.append((stage, validator, started - self.origin, duration, failed))
+
+    def reset(self) -> list[tuple]:
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+    def report(self, spans: list[tuple], top: int, validator_stage: str):
+        stages = defaultdict(list)
+        validators = defaultdict(float)
+        for stage, validator, _, duration, _ in spans:
+            stages[stage].append(duration)
+            if stage == validator_stage and validator is not None:
+                validators[validator] += duration
+
+        logger.info(f"[trace] {len(spans)} spans, stage timings (count / total / p50 / p95 / max):")
+        for stage, durations in sorted(stages.items(), key=lambda item: sum(item[1]), reverse=True)[:top]:
+            durations.sort()
+            logger.info(
+                f"[trace] {stage}: {len(durations)} / {sum(durations):.2f}s / "
+                f"{_percentile(durations, 50):.3f}s / {_percentile(durations, 95):.3f}s / {durations[-1]:.3f}s"
+            )
+
+        slowest = sorted(validators.items(), key=lambda item: item[1], reverse=True)[:top]
+        if slowest:
+            logger.info(
+                "[trace] slowest validators: " +
+                ', '.join(f"#{validator} {duration:.2f}s" for validator, duration in slowest)
+            )
+
+    @staticmethod
+    def dump(spans: list[tuple], path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump([
+                {'stage': stage, 'validator': validator, 'start': round(start, 6), 'duration': round(duration, 6),
+                 'failed': failed}
+                for stage, validator, start, duration, failed in spans
+            ], file)
+
+
+tracer = Tracer()